@@ -1,44 +1,84 @@
-import math
+import heapq
+import os
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
 from math import ceil
-from ortools.linear_solver import pywraplp
 
+from bounds import (
+    assignment_to_bins,
+    best_lower_bound,
+    heuristic_upper_bound,
+    lower_bound_l2,
+)
 
-def next_fit(items, L):
+# OR-Tools (pywraplp / cp_model) is imported inside the solvers that need it,
+# so scripts and worker processes that only run heuristics never load it
+
+
+# What a heuristic returns next to the number of bins (the `result` argument):
+#   "placement"  - placement[b] is the list of item sizes in bin b (list of lists)
+#   "assignment" - array('i') where assignment[i] is the bin id of items[i]
+#                  (numpy.frombuffer(assignment, dtype=numpy.int32) views it without a copy)
+#   "count"      - None, only the number of bins is computed
+RESULT_MODES = ("placement", "assignment", "count")
+
+
+def _result_buffers(result):
+    """
+    Return (placement, assignment) for the requested result mode,
+    the one that is not needed is None so the heuristic can skip it.
+    """
+    if result == "placement":
+        return [], None
+    if result == "assignment":
+        return None, array("i")
+    if result == "count":
+        return None, None
+    raise ValueError(f"unknown result mode: {result!r}, expected one of {RESULT_MODES}")
+
+
+def next_fit(items, L, result="placement"):
     """
     Next-Fit (NF) for 1D bin packing.
     items are used in the given order (no sorting).
     Each item is either put into the current bin or starts a new bin.
+    Only the current bin is ever looked at, so NF needs O(1) state
+    besides what the result mode asks for (see RESULT_MODES).
     """
-    bins_remaining_capacity = []
-    placement = []  # placement[i] is the list of items in the i-th bin
+    placement, assignment = _result_buffers(result)
+    num_bins = 0
+    remaining = 0  # remaining capacity of the current (last) bin
 
     for x in items:
-        # if we don't have any bin yet, open the first one
-        if not bins_remaining_capacity:
-            bins_remaining_capacity.append(L - x)
-            placement.append([x])
+        if num_bins == 0 or remaining < x:
+            # no bin yet, or x does not fit into the current bin: open a new one
+            num_bins += 1
+            remaining = L - x
+            if placement is not None:
+                placement.append([x])
         else:
-            # try to put x into the last bin
-            if bins_remaining_capacity[-1] >= x:
-                bins_remaining_capacity[-1] -= x
+            # put x into the current bin
+            remaining -= x
+            if placement is not None:
                 placement[-1].append(x)
-            else:
-                # cannot fit into current bin, then open a new one
-                bins_remaining_capacity.append(L - x)
-                placement.append([x])
 
-    return len(bins_remaining_capacity), placement
+        if assignment is not None:
+            assignment.append(num_bins - 1)
 
+    return num_bins, placement if assignment is None else assignment
 
-def first_fit(items, L):
+
+def first_fit(items, L, result="placement"):
     """
     First-Fit (FF) for 1D bin packing.
     items are used in the given order (no sorting).
     For each item, scan bins from the first one and put it
     into the first bin that has enough remaining capacity.
     """
+    placement, assignment = _result_buffers(result)
     bins_remaining_capacity = []
-    placement = []
 
     for x in items:
         chosen_index = None
@@ -51,24 +91,30 @@ def first_fit(items, L):
 
         if chosen_index is None:
             # open a new bin
+            chosen_index = len(bins_remaining_capacity)
             bins_remaining_capacity.append(L - x)
-            placement.append([x])
+            if placement is not None:
+                placement.append([x])
         else:
             bins_remaining_capacity[chosen_index] -= x
-            placement[chosen_index].append(x)
+            if placement is not None:
+                placement[chosen_index].append(x)
+
+        if assignment is not None:
+            assignment.append(chosen_index)
 
-    return len(bins_remaining_capacity), placement
+    return len(bins_remaining_capacity), placement if assignment is None else assignment
 
 
-def best_fit(items, L):
+def best_fit(items, L, result="placement"):
     """
     Best-Fit (BF) for 1D bin packing.
     items are used in the given order (no sorting).
     For each item, scan all bins and choose the one that would have
     the least remaining capacity after placing this item.
     """
+    placement, assignment = _result_buffers(result)
     bins_remaining_capacity = []
-    placement = []
 
     for x in items:
         chosen_index = None
@@ -83,42 +129,624 @@ def best_fit(items, L):
 
         if chosen_index is None:
             # open a new bin
+            chosen_index = len(bins_remaining_capacity)
             bins_remaining_capacity.append(L - x)
-            placement.append([x])
+            if placement is not None:
+                placement.append([x])
         else:
             bins_remaining_capacity[chosen_index] -= x
-            placement[chosen_index].append(x)
+            if placement is not None:
+                placement[chosen_index].append(x)
+
+        if assignment is not None:
+            assignment.append(chosen_index)
+
+    return len(bins_remaining_capacity), placement if assignment is None else assignment
+
+
+def harmonic_k(items, L, k=10, result="placement"):
+    """
+    Harmonic-k (Lee & Lee) for 1D bin packing, online and bounded-space.
+    items are used in the given order (no sorting).
+    Item x belongs to class j = min(L // x, k), i.e. x in (L/(j+1), L/j] for j < k
+    and x <= L/k for j = k. Each class has one open bin:
+      - a class j < k bin takes exactly j items and is then closed,
+      - class k items are packed with Next-Fit.
+    O(1) per item and O(k) state besides what the result mode asks for.
+    harmonic_k(items, L, k=1) is Next-Fit.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    placement, assignment = _result_buffers(result)
+    num_bins = 0
+    # open bin of each class (index 1..k): [bin id, items still allowed / remaining capacity]
+    open_bins = [None] * (k + 1)
+
+    for x in items:
+        j = k if x == 0 else min(L // x, k)
+        current = open_bins[j]
+
+        if j < k:
+            fits = current is not None
+        else:
+            fits = current is not None and current[1] >= x
+
+        if not fits:
+            # open a new bin for this class, the old one is closed for good
+            current = [num_bins, j if j < k else L]
+            open_bins[j] = current
+            num_bins += 1
+            if placement is not None:
+                placement.append([])
+
+        if j < k:
+            current[1] -= 1
+            if current[1] == 0:
+                # j items of class j fill the bin
+                open_bins[j] = None
+        else:
+            current[1] -= x
+
+        if placement is not None:
+            placement[current[0]].append(x)
+        if assignment is not None:
+            assignment.append(current[0])
+
+    return num_bins, placement if assignment is None else assignment
+
+
+def refined_harmonic(items, L, result="placement"):
+    """
+    Refined Harmonic (Lee & Lee, 20 classes) for 1D bin packing, online.
+    items are used in the given order (no sorting).
+    Harmonic-20 with the classes (1/3, 1/2] and (1/2, 1] split at 37/96 and 59/96:
+      - x > 59/96 L:          one per bin,
+      - a: 1/2 L < x <= 59/96 L: one per bin, the bin may later get one b item,
+      - 37/96 L < x <= 1/2 L:  two per bin,
+      - b: 1/3 L < x <= 37/96 L: two per bin, except every 7th b item, which
+        goes into a bin holding a single a item (or into a new bin that waits for one),
+      - x <= 1/3 L:            Harmonic classes 3..20.
+    An a item and a b item always fit together (59/96 + 37/96 = 1).
+    O(1) per item; besides the 19 open Harmonic bins only the a bins waiting
+    for a b item (and the other way round) are kept.
+    """
+    placement, assignment = _result_buffers(result)
+    k = 20
+    num_bins = 0
+    # Harmonic classes 2..k: [bin id, items still allowed / remaining capacity]
+    open_bins = [None] * (k + 1)
+    # b items, the two-per-bin ones share open_b
+    open_b = None
+    b_count = 0
+    # bins with an a item and room for a b item, and the other way round
+    a_waiting = deque()
+    b_waiting = deque()
+
+    def new_bin():
+        nonlocal num_bins
+        num_bins += 1
+        if placement is not None:
+            placement.append([])
+        return num_bins - 1
+
+    for x in items:
+        if 96 * x > 59 * L:
+            bin_id = new_bin()
+        elif 2 * x > L:
+            # a item
+            if b_waiting:
+                bin_id = b_waiting.popleft()
+            else:
+                bin_id = new_bin()
+                a_waiting.append(bin_id)
+        elif 96 * x > 37 * L or 3 * x <= L:
+            # plain Harmonic classes: 2 (37/96 L < x <= L/2) and 3..k
+            j = 2 if 3 * x > L else (k if x == 0 else min(L // x, k))
+            current = open_bins[j]
+            if current is None or (j == k and current[1] < x):
+                current = [new_bin(), j if j < k else L]
+                open_bins[j] = current
+            if j < k:
+                current[1] -= 1
+                if current[1] == 0:
+                    open_bins[j] = None
+            else:
+                current[1] -= x
+            bin_id = current[0]
+        else:
+            # b item
+            b_count += 1
+            if b_count % 7 == 0:
+                if a_waiting:
+                    bin_id = a_waiting.popleft()
+                else:
+                    bin_id = new_bin()
+                    b_waiting.append(bin_id)
+            elif open_b is None:
+                bin_id = open_b = new_bin()
+            else:
+                bin_id = open_b
+                open_b = None
+
+        if placement is not None:
+            placement[bin_id].append(x)
+        if assignment is not None:
+            assignment.append(bin_id)
+
+    return num_bins, placement if assignment is None else assignment
+
+
+def _run_decreasing(engine, items, L, result):
+    """
+    Run a heuristic on the items sorted in non-increasing order.
+    For result="assignment" the bin ids are mapped back to the
+    positions of the items in the original (unsorted) list.
+    """
+    if result != "assignment":
+        return engine(sorted(items, reverse=True), L, result=result)
+
+    items = list(items)
+    order = sorted(range(len(items)), key=items.__getitem__, reverse=True)
+    num_bins, sorted_assignment = engine([items[i] for i in order], L, result=result)
+
+    assignment = array("i", bytes(sorted_assignment.itemsize * len(items)))
+    for pos, i in enumerate(order):
+        assignment[i] = sorted_assignment[pos]
+    return num_bins, assignment
+
+
+class _MaxCapacityTree:
+    """
+    Tournament tree over the remaining capacities of the open bins.
+
+    Leaf b holds the remaining capacity of bin b, every internal node holds
+    the max of its two children, so the leftmost bin with remaining >= x is
+    found by walking down from the root in O(log bins).
+    Leaves that do not belong to an open bin hold -1, so they never fit.
+    The tree doubles its number of leaves when it runs out of them.
+    """
+
+    def __init__(self, size_hint=16):
+        size = 1
+        while size < size_hint:
+            size *= 2
+        self.size = size
+        self.tree = [-1] * (2 * size)
+        self.num_bins = 0
+
+    def _grow(self):
+        old_size = self.size
+        leaves = self.tree[old_size : 2 * old_size]
+
+        self.size = 2 * old_size
+        self.tree = [-1] * (2 * self.size)
+        self.tree[self.size : self.size + old_size] = leaves
+
+        # rebuild internal nodes bottom-up
+        tree = self.tree
+        for p in range(self.size - 1, 0, -1):
+            left = tree[2 * p]
+            right = tree[2 * p + 1]
+            tree[p] = left if left >= right else right
+
+    def get(self, b):
+        return self.tree[self.size + b]
+
+    def set(self, b, value):
+        tree = self.tree
+        p = self.size + b
+        tree[p] = value
+        p //= 2
+        while p:
+            left = tree[2 * p]
+            right = tree[2 * p + 1]
+            best = left if left >= right else right
+            if tree[p] == best:
+                # nothing above this node can change either
+                break
+            tree[p] = best
+            p //= 2
+
+    def open_bin(self, remaining):
+        if self.num_bins == self.size:
+            self._grow()
+        b = self.num_bins
+        self.num_bins += 1
+        self.set(b, remaining)
+        return b
+
+    def find_leftmost(self, x):
+        """
+        Return the index of the leftmost open bin with remaining >= x,
+        or -1 if no open bin can take x.
+        """
+        tree = self.tree
+        if tree[1] < x:
+            return -1
+        p = 1
+        size = self.size
+        while p < size:
+            p *= 2
+            if tree[p] < x:
+                p += 1
+        return p - size
+
+
+def first_fit_tree(items, L, result="placement"):
+    """
+    First-Fit (FF) backed by a max-capacity tournament tree.
+    Same packing as first_fit (same bins, same order inside each bin),
+    but the leftmost bin that fits is found in O(log bins) instead of
+    scanning every open bin, so the whole run is O(n log n).
+    """
+    placement, assignment = _result_buffers(result)
+    tree = _MaxCapacityTree()
+
+    for x in items:
+        chosen_index = tree.find_leftmost(x)
+
+        if chosen_index == -1:
+            # open a new bin
+            chosen_index = tree.open_bin(L - x)
+            if placement is not None:
+                placement.append([x])
+        else:
+            tree.set(chosen_index, tree.get(chosen_index) - x)
+            if placement is not None:
+                placement[chosen_index].append(x)
 
-    return len(bins_remaining_capacity), placement
+        if assignment is not None:
+            assignment.append(chosen_index)
 
+    return tree.num_bins, placement if assignment is None else assignment
 
-def first_fit_decreasing(items, L):
+
+# First-Fit engines that first_fit_decreasing can run on the sorted items
+FIRST_FIT_ENGINES = {
+    "scan": first_fit,
+    "tree": first_fit_tree,
+}
+
+
+def first_fit_decreasing(items, L, engine="scan", result="placement"):
     """
     First-Fit Decreasing (FFD).
     1. sort items in non-increasing order
     2. run First-Fit on this sorted sequence
+
+    engine picks the First-Fit implementation (see FIRST_FIT_ENGINES):
+    "scan" is the reference linear scan, "tree" is first_fit_tree.
+    With result="assignment", assignment[i] refers to items[i] of the unsorted input.
+    """
+    if engine not in FIRST_FIT_ENGINES:
+        raise ValueError(f"unknown First-Fit engine: {engine!r}")
+    return _run_decreasing(FIRST_FIT_ENGINES[engine], items, L, result)
+
+
+class _CapacityBuckets:
+    """
+    Open bins indexed by their remaining capacity.
+
+    buckets[r] is a min-heap of the ids of the bins with remaining capacity r,
+    and capacities is the sorted list of the r values whose bucket is not empty.
+    The tightest bin that can take x is then the smallest id in the bucket of
+    the first capacity >= x, found with one bisect.
     """
-    items = sorted(items, reverse=True)
-    return first_fit(items, L)
+
+    def __init__(self):
+        self.buckets = {}
+        self.capacities = []
+        self.num_bins = 0
+
+    def add(self, b, remaining):
+        bucket = self.buckets.get(remaining)
+        if bucket is None:
+            self.buckets[remaining] = [b]
+            insort(self.capacities, remaining)
+        else:
+            heapq.heappush(bucket, b)
+
+    def open_bin(self, remaining):
+        b = self.num_bins
+        self.num_bins += 1
+        self.add(b, remaining)
+        return b
+
+    def pop_tightest(self, x):
+        """
+        Remove and return (bin id, remaining) of the bin with the least
+        remaining capacity >= x (lowest id among ties), or (-1, None).
+        """
+        pos = bisect_left(self.capacities, x)
+        if pos == len(self.capacities):
+            return -1, None
+        remaining = self.capacities[pos]
+        bucket = self.buckets[remaining]
+        b = heapq.heappop(bucket)
+        if not bucket:
+            del self.buckets[remaining]
+            del self.capacities[pos]
+        return b, remaining
+
+
+def best_fit_indexed(items, L, result="placement"):
+    """
+    Best-Fit (BF) with the open bins indexed by remaining capacity.
+    Same packing as best_fit (ties go to the lowest bin index), but the
+    tightest bin is found with a bisect over the distinct remaining
+    capacities instead of scanning every open bin.
+    Since capacities are integers in 0..L there are at most L + 1 buckets.
+    """
+    placement, assignment = _result_buffers(result)
+    buckets = _CapacityBuckets()
+
+    for x in items:
+        chosen_index, remaining = buckets.pop_tightest(x)
+
+        if chosen_index == -1:
+            # open a new bin
+            chosen_index = buckets.open_bin(L - x)
+            if placement is not None:
+                placement.append([x])
+        else:
+            buckets.add(chosen_index, remaining - x)
+            if placement is not None:
+                placement[chosen_index].append(x)
+
+        if assignment is not None:
+            assignment.append(chosen_index)
+
+    return buckets.num_bins, placement if assignment is None else assignment
 
 
-def best_fit_decreasing(items, L):
+# Best-Fit engines that best_fit_decreasing can run on the sorted items
+BEST_FIT_ENGINES = {
+    "scan": best_fit,
+    "indexed": best_fit_indexed,
+}
+
+
+def best_fit_decreasing(items, L, engine="scan", result="placement"):
     """
     Best-Fit Decreasing (BFD).
     1. sort items in non-increasing order
     2. run Best-Fit on this sorted sequence
+
+    engine picks the Best-Fit implementation (see BEST_FIT_ENGINES):
+    "scan" is the reference linear scan, "indexed" is best_fit_indexed.
+    With result="assignment", assignment[i] refers to items[i] of the unsorted input.
     """
-    items = sorted(items, reverse=True)
-    return best_fit(items, L)
+    if engine not in BEST_FIT_ENGINES:
+        raise ValueError(f"unknown Best-Fit engine: {engine!r}")
+    return _run_decreasing(BEST_FIT_ENGINES[engine], items, L, result)
 
 
-def exact_bin_packing(items, L):
+def size_counts(items, L):
+    """
+    Counting sort of integer item sizes.
+    Returns counts, where counts[s] is the number of items of size s (s in 0..L).
+    """
+    counts = [0] * (L + 1)
+    for x in items:
+        if x < 0 or x > L:
+            raise ValueError(f"item size {x} is outside 0..{L}")
+        counts[x] += 1
+    return counts
+
+
+def _runs_decreasing(counts, L):
+    """
+    (size, count) pairs of a histogram in non-increasing size order.
+    counts is either a list indexed by size (as built by size_counts)
+    or a dict {size: count}.
+    """
+    if isinstance(counts, dict):
+        pairs = counts.items()
+    else:
+        pairs = enumerate(counts)
+
+    runs = []
+    for size, count in pairs:
+        if count <= 0:
+            continue
+        if size < 0 or size > L:
+            raise ValueError(f"item size {size} is outside 0..{L}")
+        runs.append((size, count))
+    runs.sort(reverse=True)
+    return runs
+
+
+def expand_counts_placement(placement):
+    """
+    Turn a placement of (size, count) pairs per bin into the usual
+    list-of-lists placement, e.g. [[(7, 1), (3, 1)]] -> [[7, 3]].
+    """
+    bins = []
+    for pairs in placement:
+        bin_items = []
+        for size, count in pairs:
+            bin_items.extend([size] * count)
+        bins.append(bin_items)
+    return bins
+
+
+def first_fit_decreasing_counts(counts, L, expand=False):
+    """
+    First-Fit Decreasing on a size histogram (see size_counts).
+
+    All items of one size are identical, so FF puts as many of them as fit
+    into the leftmost bin that has room, then moves on to the next such bin.
+    Whole runs are placed at once, so the cost grows with the number of
+    distinct sizes and bins, not with n.
+
+    Returns (num_bins, placement) where placement[b] is a list of
+    (size, count) pairs, or the same placement as first_fit_decreasing
+    when expand=True.
+    """
+    tree = _MaxCapacityTree()
+    placement = []
+
+    for size, count in _runs_decreasing(counts, L):
+        # fill the open bins that still have room, leftmost first
+        while count:
+            b = tree.find_leftmost(size)
+            if b == -1:
+                break
+            remaining = tree.get(b)
+            k = count if size == 0 else min(count, remaining // size)
+            tree.set(b, remaining - k * size)
+            placement[b].append((size, k))
+            count -= k
+
+        # the rest opens new bins, each holding as many as fit
+        per_bin = count if size == 0 else L // size
+        while count:
+            k = min(count, per_bin)
+            tree.open_bin(L - k * size)
+            placement.append([(size, k)])
+            count -= k
+
+    if expand:
+        placement = expand_counts_placement(placement)
+    return tree.num_bins, placement
+
+
+def best_fit_decreasing_counts(counts, L, expand=False):
+    """
+    Best-Fit Decreasing on a size histogram (see size_counts).
+
+    After BF puts an item of size s into the tightest bin, that bin is still
+    the (unique) tightest one while it has room for another s, so a whole run
+    of identical items goes into it at once before the next bin is looked up.
+
+    Returns (num_bins, placement) where placement[b] is a list of
+    (size, count) pairs, or the same placement as best_fit_decreasing
+    when expand=True.
+    """
+    buckets = _CapacityBuckets()
+    placement = []
+
+    for size, count in _runs_decreasing(counts, L):
+        # fill the tightest bins that still have room
+        while count:
+            b, remaining = buckets.pop_tightest(size)
+            if b == -1:
+                break
+            k = count if size == 0 else min(count, remaining // size)
+            buckets.add(b, remaining - k * size)
+            placement[b].append((size, k))
+            count -= k
+
+        # the rest opens new bins, each holding as many as fit
+        per_bin = count if size == 0 else L // size
+        while count:
+            k = min(count, per_bin)
+            buckets.open_bin(L - k * size)
+            placement.append([(size, k)])
+            count -= k
+
+    if expand:
+        placement = expand_counts_placement(placement)
+    return buckets.num_bins, placement
+
+
+class FailedStateCache:
+    """
+    Transposition table of backtracking states already proven infeasible.
+
+    Bins are interchangeable, so a state is identified by
+    (index of the next item, sorted remaining capacities of the bins).
+    If items[i..] could not be packed into one multiset of capacities, they
+    cannot be packed into it when the search reaches it again through a
+    different order of earlier placements.
+
+    At most max_size states are kept, the least recently used one is evicted
+    first, so memory stays bounded. hits / misses / evictions count lookups.
+    """
+
+    def __init__(self, max_size=100_000):
+        self.max_size = max_size
+        self.states = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(i, bins_remaining):
+        return (i, tuple(sorted(bins_remaining)))
+
+    def contains(self, key):
+        if key in self.states:
+            self.states.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key):
+        self.states[key] = None
+        self.states.move_to_end(key)
+        if len(self.states) > self.max_size:
+            self.states.popitem(last=False)
+            self.evictions += 1
+
+
+def exact_bin_packing(
+    items,
+    L,
+    info=None,
+    cache_size=100_000,
+    engine="iterative",
+    time_limit=None,
+    node_limit=None,
+):
     """
     Exact solution for 1-D bin Packing using backtracking.
+
+    Before searching, the instance is bracketed by the strongest Martello-Toth
+    lower bound (L1/L2/L3) and the better of FFD/BFD as upper bound (bounds.py).
+    If they meet, the heuristic packing is returned without any search,
+    otherwise only k in [LB, UB - 1] bins are tried.
+
+    info: optional dict, filled with lower_bound / lower_bound_name,
+    upper_bound / upper_bound_name and closed_by ("bounds" if LB == UB,
+    "search" otherwise), plus cache_hits / cache_misses / cache_evictions
+    and status (see below).
+
+    time_limit (seconds) / node_limit (items placed, summed over all k):
+    budget of the search. When it runs out, the best packing found so far
+    (the FFD/BFD one) is returned, info["status"] is "feasible" instead of
+    "optimal" and info["lower_bound"] is the best proven bound: lb, raised to
+    k + 1 for every k already proven infeasible.
+
+    cache_size: max number of infeasible states kept in the FailedStateCache
+    shared by all k, 0 turns the cache off.
+
+    engine: "iterative" (search_assignments_iterative, explicit stack, no
+    recursion limit, also reports nodes in info) or "recursive"
+    (search_assignments, the reference). Both explore the same tree in the
+    same order and return the same packing.
     """
+    if engine not in ("iterative", "recursive"):
+        raise ValueError(f"unknown exact search engine: {engine!r}")
+    if engine == "recursive" and (time_limit is not None or node_limit is not None):
+        raise ValueError("time_limit / node_limit need the iterative engine")
+
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
 
     n = len(items)
     if n == 0:
+        if info is not None:
+            info.update(
+                lower_bound=0,
+                lower_bound_name=None,
+                upper_bound=0,
+                upper_bound_name=None,
+                closed_by="bounds",
+                status="optimal",
+            )
         return 0, []
 
     # Sort items in descending order, but keep original indices
@@ -153,15 +781,30 @@ def exact_bin_packing(items, L):
     # sorted_items = [9, 7, 3]
 
     # Lower and upper bounds on number of bins
-    total = sum(sorted_items)
-    lb = math.ceil(total / L)  # minimum possible bins, but may not be feasible
-    ub = n  # maximum, each item takes its own bin
+    # lb: strongest of L1/L2/L3, minimum possible bins, but may not be feasible
+    # ub: bins used by the better of FFD/BFD, always feasible
+    ub, ub_assignment, ub_name = heuristic_upper_bound(items, L)
+    lb, lb_name = best_lower_bound(sorted_items, L, target=ub)
+
+    if info is not None:
+        info.update(
+            lower_bound=lb,
+            lower_bound_name=lb_name,
+            upper_bound=ub,
+            upper_bound_name=ub_name,
+            closed_by="bounds" if lb >= ub else "search",
+        )
+
+    failed = FailedStateCache(cache_size) if cache_size else None
+    counters = {"nodes": 0}
+    timed_out = False
 
     best_k = None
     best_assignment = None
 
-    # starting from the possible lower bound lb, try increasing k and then call search_assignments to find whether a feasible packing which uses k bins exists
-    for k in range(lb, ub + 1):
+    # starting from the lower bound lb, try increasing k and then call search_assignments to find whether a feasible packing which uses k bins exists
+    # only k < ub can beat the heuristic packing, so k = ub is never searched
+    for k in range(lb, ub):
 
         # Initialize remaining capacity for each bin
         bins_remaining = []
@@ -175,10 +818,53 @@ def exact_bin_packing(items, L):
             assignment.append(-1)
 
         # Try to pack all items into k bins
-        if search_assignments(0, sorted_items, bins_remaining, assignment):
+        if engine == "iterative":
+            nodes_left = None
+            if node_limit is not None:
+                nodes_left = node_limit - counters["nodes"]
+            found = search_assignments_iterative(
+                sorted_items,
+                bins_remaining,
+                assignment,
+                failed,
+                counters,
+                deadline=deadline,
+                node_limit=nodes_left,
+            )
+        else:
+            found = search_assignments(
+                0, sorted_items, bins_remaining, assignment, failed
+            )
+
+        if found is None:
+            # out of budget: k is not decided, lb == k is what has been proven
+            timed_out = True
+            break
+        if found:
             best_k = k
             best_assignment = assignment[:]  # make a copy
             break
+        # k bins are proven not enough
+        lb = k + 1
+        lb_name = "search"
+
+    if info is not None:
+        info.update(
+            cache_hits=failed.hits if failed else 0,
+            cache_misses=failed.misses if failed else 0,
+            cache_evictions=failed.evictions if failed else 0,
+        )
+        if engine == "iterative":
+            info["nodes"] = counters["nodes"]
+        # lb now is the best proven lower bound (== ub unless timed out)
+        info["status"] = "feasible" if timed_out else "optimal"
+        info["lower_bound"] = best_k if best_k is not None else lb
+        info["lower_bound_name"] = lb_name
+
+    if best_k is None:
+        # no k < ub works (or lb == ub), the heuristic packing is optimal
+        # ub_assignment[i] is already the bin of original item i
+        return ub, assignment_to_bins(ub_assignment, ub)
 
     # Convert assignment back to original item indices
     bins = []
@@ -197,7 +883,7 @@ def exact_bin_packing(items, L):
     return best_k, bins
 
 
-def search_assignments(i, items, bins_remaining, assignment):
+def search_assignments(i, items, bins_remaining, assignment, failed=None):
     """
     Backtracking: try to place item i into one of the bins.
 
@@ -205,6 +891,8 @@ def search_assignments(i, items, bins_remaining, assignment):
     items: a list, sizes sorted in descending order
     bins_remaining: a list, remaining capacity in each bin
     assignment: a list, assignment[i] = bin id for item i
+    failed: optional FailedStateCache, states already known to fail are skipped
+            and every state that fails here is added to it
 
     what we are doing: given i, try to assign items[i..end] into bins——bins_remaining shows the number of bins and the remaining capacity of each bin
     return True if a complete feasible assignment is found.
@@ -216,6 +904,11 @@ def search_assignments(i, items, bins_remaining, assignment):
     if i == n:
         return True
 
+    if failed is not None:
+        state = failed.key(i, bins_remaining)
+        if failed.contains(state):
+            return False
+
     size_i = items[i]
 
     # avoid trying bins with the same remaining capacity
@@ -242,7 +935,7 @@ def search_assignments(i, items, bins_remaining, assignment):
             assignment[i] = b
 
             # Continue with next item
-            if search_assignments(i + 1, items, bins_remaining, assignment):
+            if search_assignments(i + 1, items, bins_remaining, assignment, failed):
                 return True
 
             # Backtrack
@@ -250,47 +943,203 @@ def search_assignments(i, items, bins_remaining, assignment):
             bins_remaining[b] += size_i
 
     # No bin worked
+    if failed is not None:
+        failed.add(state)
     return False
 
 
-def mip_bin_packing(items, L):
+def search_assignments_iterative(
+    items,
+    bins_remaining,
+    assignment,
+    failed=None,
+    counters=None,
+    deadline=None,
+    node_limit=None,
+    stop=None,
+):
+    """
+    Same search as search_assignments(0, items, bins_remaining, assignment, failed),
+    driven by an explicit stack instead of recursion.
+
+    All per-level state lives in arrays allocated once per call:
+        next_bin[i]: the next bin to try for item i
+        tried[i]:    set of capacities already tried for item i (cleared, not rebuilt)
+        states[i]:   cache key of level i (only with a FailedStateCache)
+    assignment doubles as the stack of chosen bins, so backtracking just undoes
+    assignment[i]. There is no recursion, so any number of items works.
+
+    counters: optional dict, counters["nodes"] is increased by the number of
+    items placed during the search.
+    deadline (time.perf_counter() value) / node_limit (items placed): budget,
+    checked every 1024 nodes / every node.
+    stop: optional callable, also checked every 1024 nodes; the search gives up
+    as soon as it returns True (e.g. another process settled this question).
+    return True if a complete feasible assignment is found (left in assignment),
+    False if there is none, None if the budget ran out or stop() said so first
+    (bins_remaining and assignment are then left in the middle of the search).
+    """
+    n = len(items)
+    num_bins = len(bins_remaining)
+    if n == 0:
+        return True
+
+    next_bin = [0] * n
+    tried = [set() for _ in range(n)]
+    states = [None] * n
+    nodes = 0
+
+    i = 0
+    entering = True  # True when level i is reached from above (not by backtracking)
+    found = False
+    if node_limit is not None and node_limit <= 0:
+        return None
+
+    while True:
+        exhausted = False
+
+        if entering:
+            if i == n:
+                found = True
+                break
+            entering = False
+            next_bin[i] = 0
+            tried[i].clear()
+            if failed is not None:
+                states[i] = failed.key(i, bins_remaining)
+                if failed.contains(states[i]):
+                    # known to fail, do not record it again
+                    states[i] = None
+                    exhausted = True
+
+        if not exhausted:
+            # find the next bin with a not-yet-tried capacity that fits items[i]
+            size_i = items[i]
+            tried_i = tried[i]
+            b = next_bin[i]
+            chosen = -1
+            while b < num_bins:
+                cap = bins_remaining[b]
+                b += 1
+                if cap in tried_i:
+                    continue
+                tried_i.add(cap)
+                if cap >= size_i:
+                    chosen = b - 1
+                    break
+            next_bin[i] = b
+
+            if chosen != -1:
+                # place item i and go one level down
+                bins_remaining[chosen] -= size_i
+                assignment[i] = chosen
+                nodes += 1
+                i += 1
+                entering = True
+
+                if node_limit is not None and nodes >= node_limit and i < n:
+                    found = None
+                    break
+                if not nodes & 1023:
+                    if deadline is not None and time.perf_counter() > deadline:
+                        found = None
+                        break
+                    if stop is not None and stop():
+                        found = None
+                        break
+                continue
+
+            # No bin worked
+            if failed is not None:
+                failed.add(states[i])
+
+        # backtrack: undo the placement of the previous item
+        i -= 1
+        if i < 0:
+            break
+        b = assignment[i]
+        bins_remaining[b] += items[i]
+        assignment[i] = -1
+
+    if counters is not None:
+        counters["nodes"] = counters.get("nodes", 0) + nodes
+    return found
+
+
+def mip_bin_packing(items, L, info=None, time_limit=None, node_limit=None):
     """
     Exact 1-D bin packing using the MIP solver from Google OR-Tools.
     MIP: Mixed Integer Programming model.
 
-    This function is a lightly adapted version of the official OR-Tools
-    bin packing example. It's adjusted to fit the experiment.
-
-    The MIP model:
-        - Binary variable x[i, j] = 1 if item i is packed in bin j.
-        - Binary variable y[j]    = 1 if bin j is used.
-        - Each item must be in exactly one bin.
+    This function started as a lightly adapted version of the official OR-Tools
+    bin packing example. The model is slimmed down with bounds and symmetry breaking.
+
+    The MIP model (items sorted in non-increasing order, i = sorted position):
+        - Only UB bins, where UB is the FFD/BFD bin count (bounds.py),
+          instead of one bin per item.
+        - Binary variable x[i, j] = 1 if item i is packed in bin j, only for j <= i:
+          bins are numbered by the first (largest) item they hold.
+        - Binary variable y[j]    = 1 if bin j is used, with y[j] >= y[j + 1]
+          so the used bins are always 0..k-1.
+        - Each item must be in exactly one bin, and only in a used one (x[i, j] <= y[j]).
         - The total size in each bin cannot exceed the capacity L.
+        - sum(y) >= L2 lower bound (at least ceil(sum / L)).
         - Objective: minimize the number of bins used.
+    The FFD/BFD packing satisfies all of these and is given to SCIP as a hint.
+
+    time_limit (seconds) / node_limit (SCIP branch-and-bound nodes): budget of
+    the solve. When it runs out, the best packing SCIP found is returned
+    (or the FFD/BFD packing if it found none).
+
+    info: optional dict, filled with closed_by ("search", MIP always solves the model),
+    status ("optimal", or "feasible" = budget ran out, the packing returned is
+    SCIP's best or the FFD/BFD one) and lower_bound (SCIP's proven bound).
     """
 
+    if info is not None:
+        info["closed_by"] = "search"
+
     n = len(items)
     if n == 0:
+        if info is not None:
+            info.update(status="optimal", lower_bound=0)
         return 0, []
 
+    # FFD/BFD packing: number of bins in the model and warm start
+    # ub_assignment[i] is the bin of original item i
+    ub, ub_assignment, _ = heuristic_upper_bound(items, L)
+    lb = lower_bound_l2(items, L)
+
+    # sorted position -> original index, same order as the FFD/BFD run,
+    # so the heuristic packing respects the x[i, j] (j <= i) ordering
+    order = sorted(range(n), key=items.__getitem__, reverse=True)
+    sizes = [items[i] for i in order]
+
     # Create the MIP solver with the SCIP backend.
+    from ortools.linear_solver import pywraplp
+
     solver = pywraplp.Solver.CreateSolver("SCIP")
     if not solver:
-        # Fallback: degenerate solution (each item in its own bin)
+        # Fallback: the heuristic packing
         # This should rarely happen, but keeps the interface safe.
-        return n, [[i] for i in range(n)]
+        if info is not None:
+            info.update(status="feasible", lower_bound=lb)
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    if node_limit is not None:
+        solver.SetSolverSpecificParametersAsString(f"limits/nodes = {node_limit}\n")
 
-    # Indices for items and bins.
-    # As in the OR-Tools example, we allow at most n bins,
-    # one per item in the worst case.
+    # Indices for items (sorted positions) and bins.
     item_indices = list(range(n))
-    bin_indices = list(range(n))
+    bin_indices = list(range(ub))
 
     # Variables
-    # x[i, j] = 1 if item i is packed in bin j.
+    # x[i, j] = 1 if item i is packed in bin j, bin j can only hold items i >= j.
     x = {}
     for i in item_indices:
-        for j in bin_indices:
+        for j in range(min(i, ub - 1) + 1):
             x[(i, j)] = solver.IntVar(0, 1, f"x_{i}_{j}")
 
     # y[j] = 1 if bin j is used.
@@ -301,32 +1150,562 @@ def mip_bin_packing(items, L):
     # Constraints
     # Each item must be in exactly one bin.
     for i in item_indices:
-        solver.Add(sum(x[(i, j)] for j in bin_indices) == 1)
+        solver.Add(sum(x[(i, j)] for j in range(min(i, ub - 1) + 1)) == 1)
 
-    # The amount packed in each bin cannot exceed its capacity.
+    # The amount packed in each bin cannot exceed its capacity,
+    # and items only go into used bins.
     for j in bin_indices:
-        solver.Add(sum(x[(i, j)] * items[i] for i in item_indices) <= y[j] * L)
+        in_bin = range(j, n)
+        solver.Add(sum(x[(i, j)] * sizes[i] for i in in_bin) <= y[j] * L)
+        for i in in_bin:
+            solver.Add(x[(i, j)] <= y[j])
+
+    # Symmetry breaking: used bins come first.
+    for j in range(ub - 1):
+        solver.Add(y[j] >= y[j + 1])
+
+    # Lower bound on the number of bins.
+    solver.Add(sum(y[j] for j in bin_indices) >= lb)
 
     # Objective: minimize the number of bins used.
     solver.Minimize(solver.Sum(y[j] for j in bin_indices))
 
+    # Warm start with the heuristic packing.
+    hint_vars = []
+    hint_values = []
+    for i in item_indices:
+        ub_bin = ub_assignment[order[i]]
+        for j in range(min(i, ub - 1) + 1):
+            hint_vars.append(x[(i, j)])
+            hint_values.append(1.0 if j == ub_bin else 0.0)
+    for j in bin_indices:
+        hint_vars.append(y[j])
+        hint_values.append(1.0)
+    solver.SetHint(hint_vars, hint_values)
+
     status = solver.Solve()
 
-    if status != pywraplp.Solver.OPTIMAL:
-        # In principle, for small instances we expect an optimal solution.
-        # If not, return a simple feasible solution to keep the interface consistent.
-        return n, [[i] for i in range(n)]
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        # Out of budget before SCIP had a packing of its own (or the solve failed).
+        # The heuristic packing is still feasible.
+        if info is not None:
+            info.update(status="feasible", lower_bound=lb)
+        return ub, assignment_to_bins(ub_assignment, ub)
 
     # Extract the solution: placement[b] is a list of original item indices in bin b.
     placement = []
     for j in bin_indices:
         if y[j].solution_value() > 0.5:  # bin j is used
             bin_items = []
-            for i in item_indices:
+            for i in range(j, n):
                 if x[(i, j)].solution_value() > 0.5:
-                    bin_items.append(i)
+                    bin_items.append(order[i])
             if bin_items:
-                placement.append(bin_items)
+                placement.append(sorted(bin_items))
+
+    num_bins = len(placement)
+
+    if info is not None:
+        if status == pywraplp.Solver.OPTIMAL:
+            info.update(status="optimal", lower_bound=num_bins)
+        else:
+            # bins are integral, so the proven bound can be rounded up
+            best_bound = ceil(solver.Objective().BestBound() - 1e-6)
+            best_bound = max(best_bound, lb)
+            info.update(status="feasible", lower_bound=min(best_bound, num_bins))
+
+    return num_bins, placement
+
+
+def _arcflow_graph(counts, L):
+    """
+    Arc-flow graph of Valerio de Carvalho for integer capacity L.
+
+    Nodes are the capacity levels 0..L reachable by stacking items in
+    non-increasing size order, an arc (a, a + s) means "an item of size s fills
+    the bin from level a to a + s". Every bin is a path from 0 to L, the last
+    step being a loss arc (a, L) for the unused space.
+    Arcs of one size only start at levels reachable with larger sizes and at
+    most counts[s] copies of s, which keeps the graph small.
+
+    counts: list of (size, count) pairs in non-increasing size order.
+    Returns (item_arcs, loss_arcs): item_arcs is a list of (tail, head, size),
+    loss_arcs a list of (tail, L).
+    """
+    reachable = {0}
+    item_arcs = []
+    for size, count in counts:
+        if size == 0:
+            continue
+        new_levels = set()
+        for level in reachable:
+            # up to count copies of this size stacked on top of level
+            a = level
+            for _ in range(count):
+                if a + size > L:
+                    break
+                new_levels.add(a)
+                a += size
+                new_levels.add(a)
+        for a in sorted(new_levels):
+            if a + size <= L and a + size in new_levels:
+                item_arcs.append((a, a + size, size))
+        reachable |= new_levels
+
+    loss_arcs = [(a, L) for a in sorted(reachable) if a < L]
+    return item_arcs, loss_arcs
+
+
+def arcflow_bin_packing(items, L, info=None, time_limit=None, node_limit=None):
+    """
+    Exact 1-D bin packing with the arc-flow model (Valerio de Carvalho),
+    solved with the OR-Tools linear solver (SCIP backend).
+
+    The model:
+        - Integer variable f[arc] = number of bins using the arc (see _arcflow_graph).
+        - Flow conservation at every level 0 < a < L, z bins leave level 0.
+        - Demand: the arcs of size s carry at least counts[s] items
+          (extra copies are simply dropped when the flow is decoded).
+        - L2 lower bound <= z <= FFD/BFD upper bound, FFD/BFD packing as hint.
+        - Objective: minimize z.
+    The model size depends on L and the number of distinct sizes, not on n,
+    and its LP relaxation is much tighter than the assignment model of
+    mip_bin_packing.
+
+    Item sizes are integers in 0..L. Zero-size items are put in the first bin.
+    time_limit / node_limit / info: as in mip_bin_packing.
+    Returns (num_bins, placement), placement[b] lists original item indices.
+    """
+
+    if info is not None:
+        info["closed_by"] = "search"
+
+    n = len(items)
+    if n == 0:
+        if info is not None:
+            info.update(status="optimal", lower_bound=0)
+        return 0, []
+
+    ub, ub_assignment, _ = heuristic_upper_bound(items, L)
+    lb = lower_bound_l2(items, L)
+
+    from ortools.linear_solver import pywraplp
+
+    solver = pywraplp.Solver.CreateSolver("SCIP")
+    if not solver:
+        if info is not None:
+            info.update(status="feasible", lower_bound=lb)
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    if node_limit is not None:
+        solver.SetSolverSpecificParametersAsString(f"limits/nodes = {node_limit}\n")
+
+    # original indices of the items of each size
+    pools = {}
+    for i in range(n):
+        pools.setdefault(items[i], []).append(i)
+    counts = sorted(((s, len(idx)) for s, idx in pools.items()), reverse=True)
+
+    item_arcs, loss_arcs = _arcflow_graph(counts, L)
+
+    # Variables
+    z = solver.IntVar(lb, ub, "z")
+    f_item = [
+        solver.IntVar(0, pywraplp.Solver.infinity(), f"f_{a}_{b}") for a, b, _ in item_arcs
+    ]
+    f_loss = [solver.IntVar(0, pywraplp.Solver.infinity(), f"loss_{a}") for a, _ in loss_arcs]
+
+    # Flow conservation
+    flow_in = {}
+    flow_out = {}
+    for var, (a, b, _) in zip(f_item, item_arcs):
+        flow_out.setdefault(a, []).append(var)
+        flow_in.setdefault(b, []).append(var)
+    for var, (a, b) in zip(f_loss, loss_arcs):
+        flow_out.setdefault(a, []).append(var)
+        flow_in.setdefault(b, []).append(var)
+
+    solver.Add(sum(flow_out.get(0, [])) == z)
+    for level in set(flow_in) | set(flow_out):
+        if 0 < level < L:
+            solver.Add(sum(flow_in.get(level, [])) == sum(flow_out.get(level, [])))
+
+    # Demand for every (non-zero) size
+    by_size = {}
+    for var, (_, _, size) in zip(f_item, item_arcs):
+        by_size.setdefault(size, []).append(var)
+    for size, count in counts:
+        if size > 0:
+            solver.Add(sum(by_size[size]) >= count)
+
+    # Objective: minimize the number of bins used.
+    solver.Minimize(z)
+
+    # Warm start: every heuristic bin, largest item first, is a path in the graph.
+    arc_index = {(a, size): k for k, (a, _, size) in enumerate(item_arcs)}
+    loss_index = {a: k for k, (a, _) in enumerate(loss_arcs)}
+    hint_item = [0] * len(item_arcs)
+    hint_loss = [0] * len(loss_arcs)
+    for bin_items in assignment_to_bins(ub_assignment, ub):
+        level = 0
+        for size in sorted((items[i] for i in bin_items), reverse=True):
+            if size == 0:
+                continue
+            hint_item[arc_index[(level, size)]] += 1
+            level += size
+        if level < L:
+            hint_loss[loss_index[level]] += 1
+    solver.SetHint(
+        [z] + f_item + f_loss,
+        [float(ub)] + [float(v) for v in hint_item] + [float(v) for v in hint_loss],
+    )
+
+    status = solver.Solve()
+
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        if info is not None:
+            info.update(status="feasible", lower_bound=lb)
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    # Decode: follow positive flow from level 0 to L, once per bin.
+    out_arcs = {}
+    for var, (a, b, size) in zip(f_item, item_arcs):
+        flow = int(round(var.solution_value()))
+        if flow > 0:
+            out_arcs.setdefault(a, []).append([flow, b, size])
+    for var, (a, b) in zip(f_loss, loss_arcs):
+        flow = int(round(var.solution_value()))
+        if flow > 0:
+            out_arcs.setdefault(a, []).append([flow, b, 0])
+
+    placement = []
+    for _ in range(int(round(z.solution_value()))):
+        bin_items = []
+        level = 0
+        while level < L and out_arcs.get(level):
+            arc = out_arcs[level][-1]
+            arc[0] -= 1
+            if arc[0] == 0:
+                out_arcs[level].pop()
+            _, level, size = arc
+            if size > 0 and pools.get(size):
+                bin_items.append(pools[size].pop())
+        if bin_items:
+            placement.append(sorted(bin_items))
+
+    # zero-size items do not appear in the model
+    if pools.get(0):
+        if not placement:
+            placement.append([])
+        placement[0] = sorted(placement[0] + pools.pop(0))
+
+    num_bins = len(placement)
+
+    if info is not None:
+        if status == pywraplp.Solver.OPTIMAL:
+            info.update(status="optimal", lower_bound=num_bins)
+        else:
+            best_bound = ceil(solver.Objective().BestBound() - 1e-6)
+            best_bound = max(best_bound, lb)
+            info.update(status="feasible", lower_bound=min(best_bound, num_bins))
+
+    return num_bins, placement
+
+
+def cpsat_bin_packing(items, L, info=None, time_limit=None, workers=None):
+    """
+    Exact 1-D bin packing with the OR-Tools CP-SAT solver.
+
+    Same model as mip_bin_packing (UB = FFD/BFD bins, x[i, j] only for j <= i
+    on the sorted items, y[j] >= y[j + 1], sum(y) >= L2, FFD/BFD hint),
+    but CP-SAT can run a portfolio of num_workers parallel search workers.
+
+    workers: number of search workers (default: all cores).
+    time_limit / info: as in mip_bin_packing, lower_bound is CP-SAT's best
+    objective bound when the time runs out.
+    """
+
+    if info is not None:
+        info["closed_by"] = "search"
+
+    n = len(items)
+    if n == 0:
+        if info is not None:
+            info.update(status="optimal", lower_bound=0)
+        return 0, []
+
+    ub, ub_assignment, _ = heuristic_upper_bound(items, L)
+    lb = lower_bound_l2(items, L)
+
+    order = sorted(range(n), key=items.__getitem__, reverse=True)
+    sizes = [items[i] for i in order]
+
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+
+    # x[i, j] = 1 if (sorted) item i is packed in bin j, only for j <= i.
+    x = {}
+    for i in range(n):
+        for j in range(min(i, ub - 1) + 1):
+            x[(i, j)] = model.NewBoolVar(f"x_{i}_{j}")
+
+    # y[j] = 1 if bin j is used.
+    y = [model.NewBoolVar(f"y_{j}") for j in range(ub)]
+
+    # Each item must be in exactly one bin.
+    for i in range(n):
+        model.AddExactlyOne(x[(i, j)] for j in range(min(i, ub - 1) + 1))
+
+    # Capacity, and items only go into used bins.
+    for j in range(ub):
+        model.Add(sum(x[(i, j)] * sizes[i] for i in range(j, n)) <= L * y[j])
+        for i in range(j, n):
+            model.AddImplication(x[(i, j)], y[j])
+
+    # Symmetry breaking: used bins come first.
+    for j in range(ub - 1):
+        model.AddImplication(y[j + 1], y[j])
+
+    # Lower bound on the number of bins.
+    model.Add(sum(y) >= lb)
+
+    model.Minimize(sum(y))
+
+    # Warm start with the heuristic packing.
+    for i in range(n):
+        ub_bin = ub_assignment[order[i]]
+        for j in range(min(i, ub - 1) + 1):
+            model.AddHint(x[(i, j)], j == ub_bin)
+    for j in range(ub):
+        model.AddHint(y[j], True)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = workers or os.cpu_count() or 1
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+
+    status = solver.Solve(model)
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # no packing of its own in time: the heuristic one is still feasible
+        if info is not None:
+            info.update(status="feasible", lower_bound=lb)
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    placement = []
+    for j in range(ub):
+        if solver.Value(y[j]):
+            bin_items = [order[i] for i in range(j, n) if solver.Value(x[(i, j)])]
+            if bin_items:
+                placement.append(sorted(bin_items))
+
+    num_bins = len(placement)
+
+    if info is not None:
+        if status == cp_model.OPTIMAL:
+            info.update(status="optimal", lower_bound=num_bins)
+        else:
+            best_bound = ceil(solver.BestObjectiveBound() - 1e-6)
+            best_bound = max(best_bound, lb)
+            info.update(status="feasible", lower_bound=min(best_bound, num_bins))
+
+    return num_bins, placement
+
+
+def _bin_patterns(sizes, L):
+    """
+    Every way to fill one bin with the given distinct sizes (largest first).
+    Returns one list per size index d: the patterns whose largest item is
+    sizes[d], as (load, counts) with counts[k] copies of sizes[k],
+    fullest patterns first.
+    """
+    by_first = [[] for _ in sizes]
+    counts = [0] * len(sizes)
+
+    def extend(k, room):
+        if k == len(sizes):
+            first = next((d for d, c in enumerate(counts) if c), None)
+            if first is not None:
+                by_first[first].append((L - room, tuple(counts)))
+            return
+        for c in range(room // sizes[k] + 1):
+            counts[k] = c
+            extend(k + 1, room - c * sizes[k])
+        counts[k] = 0
+
+    extend(0, L)
+    for patterns in by_first:
+        patterns.sort(reverse=True)
+    return by_first
+
+
+def count_dp_bin_packing(items, L, info=None, time_limit=None):
+    """
+    Exact 1-D bin packing for small L over item-count vectors.
+
+    With integer sizes in 1..L there are at most L distinct sizes, so an
+    instance is a count vector and one bin is a pattern (a count vector with
+    load <= L). OPT(state) = 1 + min OPT(state - pattern), memoized on the
+    remaining counts. Only patterns holding the largest remaining item and
+    leaving no room for any other remaining item are tried (some optimal
+    packing has its first bin like that), fullest first, and a pattern is
+    skipped when 1 + L1(rest) cannot beat the best one found so far.
+    There are at most prod(count[s] + 1) states, polynomial in n for a fixed L,
+    unlike the exponential exact_bin_packing.
+
+    Like exact_bin_packing, the strongest lower bound is compared with FFD/BFD
+    first and the heuristic packing is returned when they meet.
+    The search uses an explicit stack, so deep instances (many bins) are fine.
+
+    time_limit (seconds): when it runs out, the FFD/BFD packing is returned
+    with info["status"] = "feasible".
+    info: optional dict, filled with lower_bound / lower_bound_name,
+    upper_bound / upper_bound_name, closed_by, status and states
+    (number of memoized count vectors).
+    Item sizes are integers in 0..L. Zero-size items are put in the first bin.
+    Returns (num_bins, placement), placement[b] lists original item indices.
+    """
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+
+    n = len(items)
+    if n == 0:
+        if info is not None:
+            info.update(
+                lower_bound=0,
+                lower_bound_name=None,
+                upper_bound=0,
+                upper_bound_name=None,
+                closed_by="bounds",
+                status="optimal",
+                states=0,
+            )
+        return 0, []
+
+    ub, ub_assignment, ub_name = heuristic_upper_bound(items, L)
+    lb, lb_name = best_lower_bound(items, L, target=ub)
+
+    if info is not None:
+        info.update(
+            lower_bound=lb,
+            lower_bound_name=lb_name,
+            upper_bound=ub,
+            upper_bound_name=ub_name,
+            closed_by="bounds" if lb >= ub else "search",
+            status="optimal",
+            states=0,
+        )
+
+    if lb >= ub:
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    # original indices of the items of each size, largest size first
+    pools = {}
+    for i in range(n):
+        pools.setdefault(items[i], []).append(i)
+    sizes = sorted((s for s in pools if s > 0), reverse=True)
+    d = len(sizes)
+    patterns = _bin_patterns(sizes, L)
+
+    # memo[state] = (OPT(state), pattern of the first bin of an optimal packing)
+    memo = {(0,) * d: (0, None)}
+
+    def new_frame(state, total, bound):
+        # [state, total size, lower bound, largest size index, next pattern,
+        #  best, best pattern, pattern of the child being searched]
+        first = next(k for k in range(d) if state[k])
+        return [state, total, max(bound, -(-total // L)), first, 0, None, None, None]
+
+    start = tuple(len(pools[s]) for s in sizes)
+    stack = [] if start in memo else [new_frame(start, sum(items), lb)]
+    returned = None
+    expanded = 0
+    timed_out = False
+
+    while stack:
+        frame = stack[-1]
+        state, total, bound, first, pos, best, best_pattern, pending = frame
+
+        if returned is not None:
+            # the child reached with `pending` just finished
+            if best is None or 1 + returned < best:
+                best, best_pattern = 1 + returned, pending
+            returned = None
+
+        child = None
+        candidates = patterns[first]
+        # stop as soon as the bound of this state is reached
+        while best != bound and pos < len(candidates):
+            load, pattern = candidates[pos]
+            pos += 1
+            if any(pattern[k] > state[k] for k in range(first, d)):
+                continue
+            # maximal: nothing left over fits into the free space
+            room = L - load
+            if any(state[k] > pattern[k] and sizes[k] <= room for k in range(first, d)):
+                continue
+            rest = total - load
+            if best is not None and 1 + (-(-rest // L)) >= best:
+                continue
+            nxt = tuple(state[k] - pattern[k] for k in range(d))
+            known = memo.get(nxt)
+            if known is None:
+                child = (nxt, rest, pattern)
+                break
+            if best is None or 1 + known[0] < best:
+                best, best_pattern = 1 + known[0], pattern
+
+        frame[4:8] = [pos, best, best_pattern, None]
+        if child is None:
+            memo[state] = (best, best_pattern)
+            stack.pop()
+            returned = best
+            continue
+
+        nxt, rest, frame[7] = child
+        stack.append(new_frame(nxt, rest, 0))
+        expanded += 1
+        if deadline is not None and expanded % 1024 == 0:
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+
+    if info is not None:
+        info["states"] = len(memo)
+
+    if timed_out or memo[start][0] >= ub:
+        if info is not None:
+            if timed_out:
+                info["status"] = "feasible"
+            else:
+                info["lower_bound"] = ub
+                info["lower_bound_name"] = "search"
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    # follow the memoized first bins from the full count vector
+    placement = []
+    state = start
+    while any(state):
+        _, pattern = memo[state]
+        bin_items = []
+        for k, count in enumerate(pattern):
+            for _ in range(count):
+                bin_items.append(pools[sizes[k]].pop())
+        placement.append(sorted(bin_items))
+        state = tuple(state[k] - pattern[k] for k in range(d))
+
+    # zero-size items are not part of any pattern
+    if pools.get(0):
+        if not placement:
+            placement.append([])
+        placement[0] = sorted(placement[0] + pools.pop(0))
 
     num_bins = len(placement)
+    if info is not None:
+        info["lower_bound"] = num_bins
+        info["lower_bound_name"] = "search"
     return num_bins, placement
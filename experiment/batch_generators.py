@@ -0,0 +1,178 @@
+import numpy as np
+
+
+# Each generator below draws the same distribution as its counterpart in
+# input_generators.py, for a whole (trials, n) array at once.
+#
+# seed: int / None / SeedSequence. With per_trial=False one Generator fills
+# the whole array. With per_trial=True row t comes from its own
+# SeedSequence(seed, spawn_key=(first_trial + t,)) (the t-th child of
+# SeedSequence(seed)), so any single trial can be regenerated on its own:
+#     batch_uniform(1, n, L, seed=s, per_trial=True, first_trial=t)
+# gives row t of batch_uniform(trials, n, L, seed=s, per_trial=True).
+
+
+def _fill(draw, trials, n, L, seed, per_trial, first_trial):
+    # draw(rng, shape, L) -> int array of that shape
+    if not per_trial:
+        return draw(np.random.default_rng(seed), (trials, n), L)
+
+    entropy = seed.entropy if isinstance(seed, np.random.SeedSequence) else seed
+    if entropy is None:
+        # fresh entropy, shared by all rows of this call
+        entropy = np.random.SeedSequence().entropy
+    batch = np.empty((trials, n), dtype=np.int64)
+    for t in range(trials):
+        rng = np.random.default_rng(
+            np.random.SeedSequence(entropy, spawn_key=(first_trial + t,))
+        )
+        batch[t] = draw(rng, (n,), L)
+    return batch
+
+
+def _randint(rng, low, high, shape):
+    # random.randint(low, high): both ends inclusive
+    return rng.integers(low, high, size=shape, endpoint=True, dtype=np.int64)
+
+
+def _draw_uniform(rng, shape, L):
+    return _randint(rng, 1, L, shape)
+
+
+def _draw_many_small(rng, shape, L):
+    small = rng.random(shape) < 0.7
+    return np.where(
+        small,
+        _randint(rng, 1, max(1, L // 3), shape),
+        _randint(rng, max(1, L // 3 + 1), L, shape),
+    )
+
+
+def _draw_many_large(rng, shape, L):
+    large = rng.random(shape) < 0.7
+    return np.where(
+        large,
+        _randint(rng, L // 2, L, shape),
+        _randint(rng, 1, max(1, L // 2 - 1), shape),
+    )
+
+
+def _draw_bimodal(rng, shape, L):
+    small = rng.random(shape) < 0.5
+    return np.where(
+        small,
+        _randint(rng, 1, max(1, L // 4), shape),
+        _randint(rng, L // 2, min(L, 3 * L // 4), shape),
+    )
+
+
+def batch_uniform(trials, n, L, seed=None, per_trial=False, first_trial=0):
+    """
+    (trials, n) array of uniform random items between 1 and L.
+    """
+    return _fill(_draw_uniform, trials, n, L, seed, per_trial, first_trial)
+
+
+def batch_many_small(trials, n, L, seed=None, per_trial=False, first_trial=0):
+    """
+    (trials, n) array, 70% small items (<= L/3), 30% large items (> L/3).
+    """
+    return _fill(_draw_many_small, trials, n, L, seed, per_trial, first_trial)
+
+
+def batch_many_large(trials, n, L, seed=None, per_trial=False, first_trial=0):
+    """
+    (trials, n) array, 70% large items (>= L/2), 30% small items (< L/2).
+    """
+    return _fill(_draw_many_large, trials, n, L, seed, per_trial, first_trial)
+
+
+def batch_bimodal(trials, n, L, seed=None, per_trial=False, first_trial=0):
+    """
+    (trials, n) array, 50% small items (<= L/4), 50% medium items (between L/2 and 3L/4).
+    """
+    return _fill(_draw_bimodal, trials, n, L, seed, per_trial, first_trial)
+
+
+def _draw_perfect_packing(rng, trials, num_bins, L):
+    """
+    Cut every bin of every trial at once: each round, every bin that still has
+    room r > 0 gets an item drawn from 1..r (random_perfect_packing's loop),
+    so the number of rounds is the largest number of items in one bin
+    (about ln L), not the number of items.
+    Returns (trials, width) items in random order, zero padded at the end.
+    """
+    # bins that still have room, flattened, and the trial each belongs to
+    remaining = np.full(trials * num_bins, L, dtype=np.int64)
+    owner = np.repeat(np.arange(trials), num_bins)
+    sizes, owners = [], []
+    while remaining.size:
+        x = _randint(rng, 1, remaining, remaining.shape)
+        sizes.append(x)
+        owners.append(owner)
+        remaining -= x
+        room = remaining > 0
+        remaining, owner = remaining[room], owner[room]
+
+    if not sizes:
+        return np.zeros((trials, 0), dtype=np.int64)
+
+    # scatter the items into rows (each round's owners are sorted, so the
+    # stable sort only merges a few runs)
+    sizes = np.concatenate(sizes)
+    owners = np.concatenate(owners)
+    order = np.argsort(owners, kind="stable")
+    sizes, owners = sizes[order], owners[order]
+    counts = np.bincount(owners, minlength=trials)
+    starts = np.cumsum(counts) - counts
+    batch = np.zeros((trials, int(counts.max())), dtype=np.int64)
+    batch[owners, np.arange(len(sizes)) - starts[owners]] = sizes
+
+    # shuffle every row, then move the padding back to the end; the stable
+    # sort keeps the shuffled order of the items
+    return _pad_right(rng.permuted(batch, axis=1))
+
+
+def _pad_right(batch):
+    # move the zeros of every row to its end (stable boolean sort, a radix
+    # sort in numpy), cut the columns that are zero in every row
+    order = np.argsort(batch == 0, axis=1, kind="stable")
+    batch = np.take_along_axis(batch, order, axis=1)
+    width = int((batch > 0).sum(axis=1).max())
+    return batch[:, :width]
+
+
+def batch_perfect_packing(trials, num_bins, L, seed=None, per_trial=False, first_trial=0):
+    """
+    (trials, width) array of items that perfectly pack into num_bins bins of
+    capacity L per row, in random order.
+    Rows have different numbers of items, shorter rows are padded with zeros
+    at the end (the padding batched.py expects); width is the longest row.
+    """
+    if not per_trial:
+        return _draw_perfect_packing(np.random.default_rng(seed), trials, num_bins, L)
+
+    entropy = seed.entropy if isinstance(seed, np.random.SeedSequence) else seed
+    if entropy is None:
+        entropy = np.random.SeedSequence().entropy
+    rows = []
+    for t in range(trials):
+        rng = np.random.default_rng(
+            np.random.SeedSequence(entropy, spawn_key=(first_trial + t,))
+        )
+        rows.append(_draw_perfect_packing(rng, 1, num_bins, L)[0])
+    width = max((len(row) for row in rows), default=0)
+    batch = np.zeros((trials, width), dtype=np.int64)
+    for t, row in enumerate(rows):
+        batch[t, : len(row)] = row
+    return batch
+
+
+# Vectorized counterpart of each generator in input_generators.py
+BATCH_GENERATORS = {
+    "random_uniform": batch_uniform,
+    "random_many_small": batch_many_small,
+    "random_many_large": batch_many_large,
+    "random_bimodal": batch_bimodal,
+    "random_perfect_packing": batch_perfect_packing,
+}
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def _as_batch(items, L):
+    """
+    items: (trials, n) integer array, one instance per row.
+    Rows may be padded with zeros at the end (e.g. perfect packing instances
+    have different lengths), zero entries are treated as "no item".
+    """
+    items = np.asarray(items)
+    if items.ndim != 2:
+        raise ValueError(f"expected a (trials, n) array, got shape {items.shape}")
+    if items.size and (items.min() < 0 or items.max() > L):
+        raise ValueError(f"item sizes must be in 1..{L} (0 = padding)")
+    return items.astype(np.int64, copy=False)
+
+
+def pad_instances(instances):
+    """
+    Stack a list of item lists into a (trials, max_len) int array,
+    padding shorter instances with zeros.
+    """
+    width = max((len(items) for items in instances), default=0)
+    batch = np.zeros((len(instances), width), dtype=np.int64)
+    for t, items in enumerate(instances):
+        batch[t, : len(items)] = items
+    return batch
+
+
+def batch_next_fit(items, L):
+    """
+    Next-Fit on every row of items at once.
+    Returns an int array with the number of bins used by each row.
+    """
+    items = _as_batch(items, L)
+    trials, n = items.shape
+    bins = np.zeros(trials, dtype=np.int64)
+    remaining = np.zeros(trials, dtype=np.int64)  # remaining capacity of the current bin
+
+    for j in range(n):
+        x = items[:, j]
+        # a real item that does not fit (or the very first item) opens a new bin
+        new_bin = (x > 0) & ((bins == 0) | (remaining < x))
+        bins += new_bin
+        remaining = np.where(new_bin, L - x, remaining - x)
+
+    return bins
+
+
+def _batch_any_fit(items, L, best):
+    """
+    First-Fit (best=False) or Best-Fit (best=True) on every row at once.
+
+    remaining[t, b] is the remaining capacity of bin b in row t. Bins that are
+    not open yet hold L, so they always fit and the first of them is exactly
+    the bin the sequential algorithm would open. Only the columns up to the
+    largest number of open bins (+1) are looked at for each item.
+    """
+    items = _as_batch(items, L)
+    trials, n = items.shape
+    rows = np.arange(trials)
+    bins = np.zeros(trials, dtype=np.int64)
+    remaining = np.full((trials, max(n, 1)), L, dtype=np.int64)
+
+    for j in range(n):
+        x = items[:, j]
+        width = int(bins.max()) + 1
+        window = remaining[:, :width]
+        fits = window >= x[:, None]
+
+        if best:
+            # tightest bin that fits, argmin takes the lowest index among ties
+            chosen = np.argmin(np.where(fits, window, L + 1), axis=1)
+        else:
+            # leftmost bin that fits
+            chosen = np.argmax(fits, axis=1)
+
+        real = x > 0
+        remaining[rows[real], chosen[real]] -= x[real]
+        bins = np.where(real, np.maximum(bins, chosen + 1), bins)
+
+    return bins
+
+
+def batch_first_fit(items, L):
+    """
+    First-Fit on every row of items at once, returns bins per row.
+    """
+    return _batch_any_fit(items, L, best=False)
+
+
+def batch_best_fit(items, L):
+    """
+    Best-Fit on every row of items at once, returns bins per row.
+    """
+    return _batch_any_fit(items, L, best=True)
+
+
+def _sort_rows_decreasing(items):
+    # zeros (padding) end up at the end of each row
+    return np.sort(np.asarray(items), axis=1)[:, ::-1]
+
+
+def batch_first_fit_decreasing(items, L):
+    """
+    First-Fit Decreasing on every row of items at once, returns bins per row.
+    """
+    return batch_first_fit(_sort_rows_decreasing(items), L)
+
+
+def batch_best_fit_decreasing(items, L):
+    """
+    Best-Fit Decreasing on every row of items at once, returns bins per row.
+    """
+    return batch_best_fit(_sort_rows_decreasing(items), L)
+
+
+# Batched versions of the heuristics, keyed like run_experiment's heuristics
+BATCH_ALGOS = {
+    "NF": batch_next_fit,
+    "FF": batch_first_fit,
+    "BF": batch_best_fit,
+    "FFD": batch_first_fit_decreasing,
+    "BFD": batch_best_fit_decreasing,
+}
+
+
+def batch_heuristic_bins(items, L, algos=None):
+    """
+    Run several batched heuristics on a (trials, n) array.
+    Returns {name: bins per trial} for every name in algos (default: all of BATCH_ALGOS).
+    """
+    if algos is None:
+        algos = list(BATCH_ALGOS)
+    return {name: BATCH_ALGOS[name](items, L) for name in algos}
@@ -0,0 +1,77 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Each case runs in a fresh interpreter: the code is timed from the first
+# import to the end, RSS is the peak resident set size of the process.
+STARTUP_CASES = {
+    # a worker that only needs the online heuristics
+    "heuristics only": (
+        "from algorithms import next_fit, first_fit, best_fit\n"
+        "first_fit([7, 6, 4, 4, 3, 3, 2, 2], 10)\n"
+    ),
+    # what every heuristic-only script paid before the solver imports were lazy
+    "heuristics + OR-Tools import": (
+        "from ortools.linear_solver import pywraplp\n"
+        "from ortools.sat.python import cp_model\n"
+        "from algorithms import next_fit, first_fit, best_fit\n"
+        "first_fit([7, 6, 4, 4, 3, 3, 2, 2], 10)\n"
+    ),
+    # the experiment driver, without running anything
+    "import run_experiment": "import run_experiment\n",
+    # first MIP solve loads OR-Tools on demand
+    "heuristics + one MIP solve": (
+        "from algorithms import first_fit, mip_bin_packing\n"
+        "first_fit([7, 6, 4, 4, 3, 3, 2, 2], 10)\n"
+        "mip_bin_packing([7, 6, 4, 4, 3, 3, 2, 2], 10)\n"
+    ),
+}
+
+_PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+exec(compile(sys.argv[1], "<case>", "exec"))
+t1 = time.perf_counter()
+print(json.dumps({
+    "seconds": t1 - t0,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "ortools": any(m.startswith("ortools") for m in sys.modules),
+}))
+"""
+
+
+def bench_startup(cases=None, repeats=5):
+    """
+    cases: {name: code} to run, default STARTUP_CASES.
+    repeats: fresh interpreters per case, the median time is reported.
+
+    Shows what a process pays before it can pack its first bin:
+    import time (ms), peak RSS (MB, Linux ru_maxrss) and whether
+    OR-Tools ended up loaded.
+    """
+    if cases is None:
+        cases = STARTUP_CASES
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    print(f"{'case':<30} {'import+run(ms)':>15} {'peak_rss(MB)':>13} {'ortools':>8}")
+    for name, code in cases.items():
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run(
+                [sys.executable, "-c", _PROBE, code],
+                cwd=here,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        ms = statistics.median(r["seconds"] for r in runs) * 1000.0
+        rss_mb = max(r["rss_kb"] for r in runs) / 1024.0
+        loaded = "yes" if runs[0]["ortools"] else "no"
+        print(f"{name:<30} {ms:15.1f} {rss_mb:13.1f} {loaded:>8}")
+
+
+if __name__ == "__main__":
+    bench_startup()
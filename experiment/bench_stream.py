@@ -0,0 +1,69 @@
+import resource
+import time
+
+from algorithms import next_fit
+from input_generators import random_uniform
+from packer import Packer
+from stream_generators import DEFAULT_CHUNK_SIZE, ItemStream
+
+
+def _drain(items, L):
+    # generation alone, no bins
+    for _ in items:
+        pass
+    return 0
+
+
+def _count_bins(packer, items):
+    # drain the closed bins as they come, then close the rest
+    for _ in packer.feed(items):
+        pass
+    packer.flush()
+    return packer.num_bins
+
+
+# What bench_stream runs on the stream: name -> (stream items, L) -> bins.
+# Only bounded-memory algorithms: NF, and FF / BF with k open bins.
+STREAM_CASES = {
+    "generate only": _drain,
+    "NF": lambda items, L: next_fit(items, L, result="count")[0],
+    "Packer FF k=8": lambda items, L: _count_bins(Packer(L, "FF", max_open_bins=8), items),
+    "Packer BF k=8": lambda items, L: _count_bins(Packer(L, "BF", max_open_bins=8), items),
+}
+
+
+def bench_stream(
+    total=10**8,
+    L=100,
+    generator=random_uniform,
+    cases=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    seed=0,
+):
+    """
+    Throughput of the online heuristics on a streamed instance of `total`
+    items (10^8 - 10^9 for load tests), generated chunk by chunk by
+    ItemStream, so memory stays flat whatever total is.
+
+    cases: {name: fn(items, L) -> bins}, default STREAM_CASES.
+    Prints bins, seconds, items per second and the peak RSS of this process so
+    far (MB, Linux ru_maxrss) after every case.
+    """
+    if cases is None:
+        cases = STREAM_CASES
+
+    print(f"{generator.__name__}, total={total:,}, L={L}, chunk_size={chunk_size}")
+    print(f"{'case':<16} {'bins':>14} {'seconds':>10} {'items/s':>14} {'peak_rss(MB)':>13}")
+    for name, run in cases.items():
+        stream = ItemStream(generator, L, total=total, chunk_size=chunk_size, seed=seed)
+        t0 = time.perf_counter()
+        bins = run(stream, L)
+        seconds = time.perf_counter() - t0
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        print(
+            f"{name:<16} {bins:>14,} {seconds:10.2f} {total / seconds:14,.0f} {rss_mb:13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    bench_stream()
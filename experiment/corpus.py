@@ -0,0 +1,254 @@
+import json
+import os
+
+import numpy as np
+
+# On-disk layout of a corpus directory:
+#   items.bin   - item sizes of every instance back to back (raw, dtype in meta.json)
+#   offsets.bin - int64, instance i is items[offsets[i]:offsets[i + 1]]
+#   meta.json   - {"dtype": ..., "instances": [{"name", "L", "n", ...}, ...]}
+ITEMS_FILE = "items.bin"
+OFFSETS_FILE = "offsets.bin"
+META_FILE = "meta.json"
+
+
+class Corpus:
+    """
+    Read-only instance store, memory mapped.
+
+    corpus[i] is instance i as a numpy view into items.bin: nothing is read
+    or copied until it is used, and processes opening the same corpus share
+    the pages through the OS cache. Use corpus.items(i) for a plain list.
+    corpus.meta[i] is its metadata dict: name, L, n and whatever the writer
+    or loader stored (e.g. source, best_known).
+
+    A Corpus can be passed to run_experiment in place of a generator function,
+    see there.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            header = json.load(f)
+        self.dtype = np.dtype(header["dtype"])
+        self.meta = header["instances"]
+
+        self._offsets = np.fromfile(os.path.join(path, OFFSETS_FILE), dtype=np.int64)
+        total = int(self._offsets[-1]) if len(self._offsets) else 0
+        if total:
+            self._items = np.memmap(
+                os.path.join(path, ITEMS_FILE), dtype=self.dtype, mode="r", shape=(total,)
+            )
+        else:
+            # np.memmap cannot map an empty file
+            self._items = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.meta)
+
+    def __reduce__(self):
+        # a pickled corpus maps the files again instead of copying the items
+        return (Corpus, (self.path,))
+
+    def __getitem__(self, i):
+        return self._items[self._offsets[i] : self._offsets[i + 1]]
+
+    def items(self, i):
+        """
+        Instance i as a list of ints (what the algorithms and solvers expect).
+        """
+        return self[i].tolist()
+
+    def select(self, n=None, L=None, **meta):
+        """
+        Indices of the instances with this n and L (None: any) and whose
+        metadata has the given values, e.g. select(L=150, source="falkenauer").
+        """
+        found = []
+        for i, m in enumerate(self.meta):
+            if n is not None and m["n"] != n:
+                continue
+            if L is not None and m["L"] != L:
+                continue
+            if any(m.get(k) != v for k, v in meta.items()):
+                continue
+            found.append(i)
+        return found
+
+
+class CorpusWriter:
+    """
+    Builds a corpus directory one instance at a time; items are streamed to
+    items.bin, only offsets and metadata are kept in memory until close().
+    append=True adds to an existing corpus (same dtype).
+    Also a context manager.
+    """
+
+    def __init__(self, path, dtype="int32", append=False):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self.meta = []
+        self.offsets = [0]
+
+        append = append and os.path.exists(os.path.join(path, META_FILE))
+        if append:
+            existing = Corpus(path)
+            self.dtype = existing.dtype
+            self.meta = list(existing.meta)
+            self.offsets = existing._offsets.tolist()
+            del existing
+        self._info = np.iinfo(self.dtype)
+        self._file = open(os.path.join(path, ITEMS_FILE), "ab" if append else "wb")
+
+    def add(self, items, L, name=None, **meta):
+        """
+        Append one instance. meta: any JSON-serializable extra fields.
+        """
+        sizes = np.asarray(items)
+        if sizes.size and (sizes.min() < 0 or sizes.max() > self._info.max):
+            raise ValueError(f"item sizes do not fit into {self.dtype}")
+        sizes.astype(self.dtype).tofile(self._file)
+        self.offsets.append(self.offsets[-1] + len(sizes))
+        if name is None:
+            name = f"instance_{len(self.meta)}"
+        self.meta.append(dict(name=name, L=int(L), n=len(sizes), **meta))
+
+    def close(self):
+        self._file.close()
+        np.asarray(self.offsets, dtype=np.int64).tofile(
+            os.path.join(self.path, OFFSETS_FILE)
+        )
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump({"dtype": self.dtype.name, "instances": self.meta}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_generated(path, generator, n, L, trials, name=None, append=True):
+    """
+    Freeze `trials` instances of an input generator into a corpus, so later
+    runs (and new algorithms) see exactly the same inputs.
+    """
+    if name is None:
+        name = generator.__name__
+    with CorpusWriter(path, append=append) as writer:
+        for t in range(trials):
+            writer.add(generator(n, L), L, name=f"{name}_{n}_{L}_{t}", source=name)
+
+
+def _sizes(tokens):
+    """
+    Item sizes from text tokens. Real-valued sizes (e.g. the OR-Library
+    triplets) are scaled by the power of ten that makes all of them integers;
+    returns (sizes, scale).
+    """
+    decimals = max((len(t.split(".")[1]) for t in tokens if "." in t), default=0)
+    scale = 10**decimals
+    sizes = [round(float(t) * scale) for t in tokens]
+    return sizes, scale
+
+
+def load_bpp(path):
+    """
+    One instance in the plain BPP text format used by BPPLIB and the Scholl,
+    Schwerin and Falkenauer files:
+        n
+        capacity
+        one item size per line (or "size count" per line for item types)
+    Returns [(name, items, L, meta)].
+    """
+    with open(path) as f:
+        lines = [line.split() for line in f if line.strip()]
+    capacity = lines[1][0]
+    tokens = []
+    for line in lines[2:]:
+        if len(line) == 2:
+            tokens.extend([line[0]] * int(line[1]))
+        else:
+            tokens.append(line[0])
+    sizes, scale = _sizes(tokens + [capacity])
+    L = sizes.pop()
+    name = os.path.splitext(os.path.basename(path))[0]
+    meta = {"source": os.path.basename(os.path.dirname(os.path.abspath(path)))}
+    if scale != 1:
+        meta["scale"] = scale
+    return [(name, sizes, L, meta)]
+
+
+def load_orlib(path):
+    """
+    Every instance of an OR-Library binpack file (binpack1..8, Falkenauer's
+    u/t sets):
+        number of problems
+        then per problem: identifier
+                          capacity  n  best known number of bins
+                          n item sizes, one per line
+    Returns [(name, items, L, meta)], meta holds best_known.
+    """
+    with open(path) as f:
+        tokens = f.read().split()
+    pos = 0
+    count = int(tokens[pos])
+    pos += 1
+    instances = []
+    for _ in range(count):
+        name = tokens[pos]
+        capacity, n, best_known = tokens[pos + 1], int(tokens[pos + 2]), int(tokens[pos + 3])
+        pos += 4
+        sizes, scale = _sizes(tokens[pos : pos + n] + [capacity])
+        pos += n
+        L = sizes.pop()
+        meta = {"source": os.path.basename(path), "best_known": best_known}
+        if scale != 1:
+            meta["scale"] = scale
+        instances.append((name, sizes, L, meta))
+    return instances
+
+
+# Text formats the loaders understand
+LOADERS = {
+    "bpp": load_bpp,
+    "orlib": load_orlib,
+}
+
+
+def _detect_format(path):
+    # OR-Library files start with the problem count followed by a name
+    with open(path) as f:
+        head = f.read(256).split()
+    if len(head) > 1 and not head[1].replace(".", "", 1).isdigit():
+        return "orlib"
+    return "bpp"
+
+
+def import_benchmarks(path, paths, fmt=None, append=True):
+    """
+    Load standard benchmark files into a corpus.
+    paths: files or directories (every file in it, sorted).
+    fmt: a key of LOADERS, default: detected per file.
+    Returns the number of instances added.
+    """
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(
+                os.path.join(p, f)
+                for f in sorted(os.listdir(p))
+                if os.path.isfile(os.path.join(p, f))
+            )
+        else:
+            files.append(p)
+
+    added = 0
+    with CorpusWriter(path, append=append) as writer:
+        for file in files:
+            loader = LOADERS[fmt or _detect_format(file)]
+            for name, items, L, meta in loader(file):
+                writer.add(items, L, name=name, **meta)
+                added += 1
+    return added
@@ -3,34 +3,50 @@ from input_generators import random_uniform
 from algorithms import exact_bin_packing
 
 
-def find_exact_limit(n_values, L=10, trials=10):
+def find_exact_limit(n_values, L=10, trials=10, cache_size=100_000, time_limit=None):
     """
     n_values: List of n values to test exact solver on.
     example: n_values = [10, 12, 14, ..., 50], each representing one input size.
     L: Capacity of each bin.
     trials: Number of random inputs to generate for each n.
+    cache_size: size of the failed-state cache of exact_bin_packing (0 = off),
+    run once with 0 and once with a cache to see what it saves.
+    time_limit: optional cap (seconds) per exact solve, solves that hit it are
+    counted as timeouts instead of stalling the probe.
 
     Probe the maximum n for which exact_bin_packing can solve within reasonable time.
     1. For each n in n_values, generate 'trials' random inputs of size n with capacity L.
     2. For each input, run exact_bin_packing and measure the time taken.
-    3. Report the average time and worst time taken for each n.
+    3. Report the average time and worst time taken for each n,
+       plus the failed-state cache hits / misses summed over the trials.
     4. This helps identify the threshold n where exact solution becomes impractical.
     """
     for n in n_values:
         total_time = 0.0
         worst = 0.0
+        hits = 0
+        misses = 0
+        timeouts = 0
         for _ in range(trials):
             sizes = random_uniform(n, L)
+            info = {}
             t0 = time.perf_counter()
-            exact_bin_packing(sizes, L)
+            exact_bin_packing(
+                sizes, L, info=info, cache_size=cache_size, time_limit=time_limit
+            )
             t1 = time.perf_counter()
+            hits += info["cache_hits"]
+            misses += info["cache_misses"]
+            if info["status"] != "optimal":
+                timeouts += 1
             dt = t1 - t0
             total_time += dt
             worst = max(worst, dt)
         avg_ms = total_time * 1000.0 / trials
         worst_ms = worst * 1000.0
         print(
-            f"n={n:2d}, L={L}:  avg_time={avg_ms:.3f} ms,  worst_time={worst_ms:.3f} ms"
+            f"n={n:2d}, L={L}:  avg_time={avg_ms:.3f} ms,  worst_time={worst_ms:.3f} ms,  "
+            f"cache hits={hits}, misses={misses},  timeouts={timeouts}"
         )
 
 
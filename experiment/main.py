@@ -1,3 +1,5 @@
+import os
+
 from input_generators import (
     random_uniform,
     random_many_small,
@@ -5,7 +7,8 @@ from input_generators import (
     random_bimodal,
     random_perfect_packing,
 )
-from run_experiment import run_experiment
+from opt_cache import OptCache
+from run_experiment import OPT_CACHE_DB, run_experiment
 
 
 if __name__ == "__main__":
@@ -29,14 +32,24 @@ if __name__ == "__main__":
         ("Perfect packing", random_perfect_packing),
     ]
 
+    # exact results of earlier runs are reused, repeated instances are not solved again
+    opt_cache = OptCache(OPT_CACHE_DB)
+
+    # the exact solvers dominate the small-n grid, so its trials run on every core
+    workers = os.cpu_count() or 1
+
     # Small n, L = 10
     for n in small_ns:
         for name, gen in small_generators:
-            run_experiment(name, gen, n=n, L=10, trials=50)
+            run_experiment(
+                name, gen, n=n, L=10, trials=50, opt_cache=opt_cache, workers=workers
+            )
             # avoid small n + large L, which is too easy because there is a high chance items won't fill up even one bin.
 
     # Big n, L = 10 and 100
     for L in L_values:
         for n in big_ns:
             for name, gen in big_generators:
-                run_experiment(name, gen, n=n, L=L, trials=50)
+                run_experiment(
+                    name, gen, n=n, L=L, trials=50, opt_cache=opt_cache
+                )
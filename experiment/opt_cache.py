@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+
+class OptCache:
+    """
+    On-disk cache of exact results (SQLite), shared between runs.
+
+    An instance is stored under a content hash of its canonical form
+    (L and the sorted item sizes), so the same multiset hits whatever order
+    the items came in. Each entry keeps:
+        opt          - bins of the best packing found
+        lower_bound  - best proven lower bound (== opt when status is "optimal")
+        status       - "optimal" or "feasible" (time_limit ran out)
+        solver       - name of the solver that produced it
+        packing      - optional, list of bins, each a list of item sizes
+
+    max_entries caps the table: when it is exceeded the least recently used
+    entries are deleted. Only "optimal" entries should be used as OPT,
+    a "feasible" one is replaced as soon as a better result is put.
+    """
+
+    def __init__(self, path, max_entries=100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS opt (
+                key TEXT PRIMARY KEY,
+                L INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                opt INTEGER NOT NULL,
+                lower_bound INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                solver TEXT,
+                packing TEXT,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS opt_last_used ON opt (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def key(items, L):
+        """
+        Content hash of the canonical instance: L and the sorted item sizes.
+        """
+        canonical = f"{L}:" + ",".join(map(str, sorted(items)))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, items, L):
+        """
+        Cached entry for this instance as a dict (see the class docstring),
+        or None. A hit refreshes the entry's LRU position.
+        """
+        key = self.key(items, L)
+        row = self.conn.execute(
+            "SELECT opt, lower_bound, status, solver, packing FROM opt WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE opt SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        self.conn.commit()
+        opt, lower_bound, status, solver, packing = row
+        return {
+            "opt": opt,
+            "lower_bound": lower_bound,
+            "status": status,
+            "solver": solver,
+            "packing": None if packing is None else json.loads(packing),
+        }
+
+    def put(self, items, L, num_bins, status, lower_bound, solver=None, placement=None):
+        """
+        Store a solver result for this instance.
+        placement (optional) lists original item indices per bin, like the
+        solvers return it; it is stored as item sizes so it fits any order.
+        An existing entry is only replaced by a better one
+        (optimal beats feasible, then fewer bins, then a higher lower bound).
+        """
+        key = self.key(items, L)
+        packing = None
+        if placement is not None:
+            packing = json.dumps([sorted((items[i] for i in b), reverse=True) for b in placement])
+
+        row = self.conn.execute(
+            "SELECT opt, lower_bound, status FROM opt WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            old = (row[2] == "optimal", -row[0], row[1])
+            new = (status == "optimal", -num_bins, lower_bound)
+            if new <= old:
+                return
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO opt VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, L, len(items), num_bins, lower_bound, status, solver, packing, time.time()),
+        )
+        if row is None:
+            self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        # drop the least recently used entries beyond max_entries
+        (size,) = self.conn.execute("SELECT COUNT(*) FROM opt").fetchone()
+        extra = size - self.max_entries
+        if extra > 0:
+            self.conn.execute(
+                "DELETE FROM opt WHERE key IN "
+                "(SELECT key FROM opt ORDER BY last_used LIMIT ?)",
+                (extra,),
+            )
+            self.evictions += extra
+
+    def __len__(self):
+        (size,) = self.conn.execute("SELECT COUNT(*) FROM opt").fetchone()
+        return size
+
+    def close(self):
+        self.conn.close()
+
+    def __reduce__(self):
+        # a pickled cache (e.g. sent to a spawned process) opens its own
+        # connection to the same file instead of copying this one
+        return (OptCache, (self.path, self.max_entries))
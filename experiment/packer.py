@@ -0,0 +1,153 @@
+from collections import deque
+
+# Online rules the Packer can run
+PACKER_ALGOS = ("NF", "FF", "BF")
+
+
+class Packer:
+    """
+    Streaming (online) bin packer for NF / FF / BF.
+
+    Items come in one at a time (add), from any iterable (feed) or from an
+    iterable of chunks such as numpy arrays (feed_chunks), and only the open
+    bins are kept in memory. A bin is closed, and then never looked at again, when
+        - it is exactly full (closed when the next item of positive size
+          comes, so zero-size items still join it like in first_fit),
+        - NF opens a new bin (NF keeps a single open bin),
+        - FF / BF must open a bin while max_open_bins bins are open:
+          FF closes the oldest open bin (Next-k-Fit),
+          BF closes the fullest one (Best-k-Fit).
+    With max_open_bins=None FF / BF never close a bin that still has room and
+    give the same number of bins as first_fit / best_fit, but then memory and
+    the time per item grow with the number of bins like theirs. Memory is only
+    bounded when max_open_bins is set (or for NF), the default is None.
+
+    Closed bins are handed out as (bin_id, sizes), bin ids count from 0 in the
+    order the bins were opened. feed() yields them as they close, after add()
+    they wait in a queue until closed_bins() is called, flush() closes the rest.
+
+    Running counts, valid at any point:
+        num_items  - items packed so far
+        num_bins   - bins opened so far (the bin count of the packing so far)
+        num_closed - bins closed so far
+        num_open   - bins currently open
+    """
+
+    def __init__(self, L, algo="FF", max_open_bins=None):
+        if algo not in PACKER_ALGOS:
+            raise ValueError(f"unknown online algorithm: {algo!r}, expected one of {PACKER_ALGOS}")
+        if max_open_bins is not None and max_open_bins < 1:
+            raise ValueError("max_open_bins must be at least 1")
+        if algo == "NF":
+            max_open_bins = 1
+
+        self.L = L
+        self.algo = algo
+        self.max_open_bins = max_open_bins
+        # bin_id -> [remaining capacity, sizes], in opening order
+        self._open = {}
+        self._closed = deque()
+        # open bin that is exactly full, closed by the next item of positive size
+        self._full = None
+        self.num_items = 0
+        self.num_bins = 0
+        self.num_closed = 0
+
+    @property
+    def num_open(self):
+        return len(self._open)
+
+    def _choose_bin(self, x):
+        # open bin for x under the algorithm's rule, None if no open bin fits
+        if self.algo == "BF":
+            chosen = None
+            best_after = None
+            for bin_id, (remaining, _) in self._open.items():
+                if remaining >= x and (best_after is None or remaining - x < best_after):
+                    chosen, best_after = bin_id, remaining - x
+            return chosen
+        for bin_id, (remaining, _) in self._open.items():
+            if remaining >= x:
+                return bin_id
+        return None
+
+    def _close(self, bin_id):
+        _, sizes = self._open.pop(bin_id)
+        self._closed.append((bin_id, sizes))
+        self.num_closed += 1
+
+    def _make_room(self):
+        # close one open bin so that a new one can be opened
+        if self.algo == "BF":
+            victim = min(self._open, key=lambda b: self._open[b][0])
+        else:
+            victim = next(iter(self._open))
+        self._close(victim)
+
+    def add(self, x):
+        """
+        Pack one item, return the id of its bin.
+        Bins closed by this item are queued for closed_bins().
+        """
+        if x < 0 or x > self.L:
+            raise ValueError(f"item size {x} is outside 0..{self.L}")
+        if x > 0 and self._full is not None:
+            self._close(self._full)
+            self._full = None
+
+        bin_id = self._choose_bin(x)
+        if bin_id is None:
+            if self.max_open_bins is not None and len(self._open) >= self.max_open_bins:
+                self._make_room()
+            bin_id = self.num_bins
+            self.num_bins += 1
+            self._open[bin_id] = [self.L, []]
+
+        entry = self._open[bin_id]
+        entry[0] -= x
+        entry[1].append(x)
+        self.num_items += 1
+
+        if entry[0] == 0 and x > 0:
+            # nothing but zero-size items fits any more
+            self._full = bin_id
+        return bin_id
+
+    def closed_bins(self):
+        """
+        Return the bins closed since the last call, as a list of (bin_id, sizes).
+        """
+        out = list(self._closed)
+        self._closed.clear()
+        return out
+
+    def feed(self, items):
+        """
+        Pack every item of an iterable (a list, a generator, chunks flattened
+        by the caller ...) and yield each bin as soon as it is closed.
+        Open bins stay open, call flush() at the end of the stream.
+        """
+        for x in items:
+            self.add(x)
+            if self._closed:
+                yield from self.closed_bins()
+
+    def feed_chunks(self, chunks):
+        """
+        Like feed, for an iterable of chunks (numpy arrays, lists, ...), e.g.
+        ItemStream.chunks(). Each chunk is packed item by item, in order.
+        """
+        for chunk in chunks:
+            # numpy arrays become Python ints, much faster to pack than numpy scalars
+            items = chunk.tolist() if hasattr(chunk, "tolist") else chunk
+            yield from self.feed(items)
+
+    def flush(self):
+        """
+        Close every open bin. Returns all bins not handed out yet
+        (queued ones first, then the open ones in opening order).
+        """
+        for bin_id in list(self._open):
+            self._close(bin_id)
+        self._full = None
+        return self.closed_bins()
@@ -0,0 +1,242 @@
+import multiprocessing
+import os
+import time
+
+from algorithms import FailedStateCache, search_assignments_iterative
+from bounds import assignment_to_bins, best_lower_bound, heuristic_upper_bound
+
+# set in every pool worker by _init_worker
+_items = None
+_found_k = None
+_infeasible_k = None
+
+
+def _init_worker(items, found_k, infeasible_k):
+    global _items, _found_k, _infeasible_k
+    _items = items
+    _found_k = found_k
+    _infeasible_k = infeasible_k
+
+
+def _split(items, k, L, depth):
+    """
+    Every placement of items[:depth] into k bins of capacity L that the
+    backtracking search would try (one bin per distinct remaining capacity),
+    in the order the search tries them. Their subtrees are disjoint and
+    together make up the whole search for k.
+    Returns a list of (bins_remaining, assignment of items[:depth]).
+    """
+    prefixes = [([L] * k, [])]
+    for i in range(depth):
+        # expand one more item, level by level
+        deeper = []
+        for bins_remaining, prefix in prefixes:
+            tried = set()
+            for b, cap in enumerate(bins_remaining):
+                if cap in tried:
+                    continue
+                tried.add(cap)
+                if cap >= items[i]:
+                    child = bins_remaining[:]
+                    child[b] -= items[i]
+                    deeper.append((child, prefix + [b]))
+        prefixes = deeper
+    return prefixes
+
+
+def _search_prefix(task):
+    """
+    Pool task: finish the search for k bins below one prefix.
+    Gives up as soon as k is settled elsewhere: a packing with <= k bins was
+    found, or some k' >= k was proven infeasible (then k is infeasible too).
+    Returns (k, found, assignment of all items or None), found as in
+    search_assignments_iterative.
+    """
+    k, depth, bins_remaining, prefix, deadline, cache_size = task
+
+    def settled():
+        return _found_k.value <= k or _infeasible_k.value >= k
+
+    if settled():
+        return k, None, None
+
+    assignment = [-1] * (len(_items) - depth)
+    failed = FailedStateCache(cache_size) if cache_size else None
+    found = search_assignments_iterative(
+        _items[depth:],
+        bins_remaining,
+        assignment,
+        failed,
+        deadline=deadline,
+        stop=settled,
+    )
+    if found:
+        with _found_k.get_lock():
+            if k < _found_k.value:
+                _found_k.value = k
+        return k, True, prefix + assignment
+    return k, found, None
+
+
+def parallel_exact_bin_packing(
+    items,
+    L,
+    info=None,
+    time_limit=None,
+    workers=None,
+    split_depth=None,
+    cache_size=100_000,
+):
+    """
+    exact_bin_packing spread over a process pool.
+
+    Same bounds as exact_bin_packing (strongest of L1/L2/L3 vs FFD/BFD, nothing
+    to search when they meet). Otherwise every k in [LB, UB - 1] is searched at
+    once: the tree of each k is split at its first split_depth items
+    (see _split) and every (k, prefix) subtree is one pool task.
+    Two shared values tell the workers when to stop:
+        found_k      - fewest bins of a packing found so far,
+                       tasks for any k >= found_k give up
+        infeasible_k - largest k proven infeasible (all its subtrees failed),
+                       tasks for any k <= infeasible_k give up, since fewer bins
+                       cannot work either
+    The answer is final once the smallest feasible k is found and every smaller k
+    is proven infeasible; the remaining tasks are then cancelled.
+
+    workers: pool size (default: all cores).
+    split_depth: items placed before splitting; default is the smallest depth
+    that gives at least 4 tasks per worker for k = LB (at most n / 2).
+    time_limit / cache_size / info: as in exact_bin_packing (the failed-state
+    cache is per task). info also gets tasks, workers and split_depth.
+    Cannot run inside a daemon process (e.g. a portfolio worker).
+    Returns (num_bins, placement), placement[b] lists original item indices.
+    """
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    n = len(items)
+    if n == 0:
+        if info is not None:
+            info.update(
+                lower_bound=0,
+                lower_bound_name=None,
+                upper_bound=0,
+                upper_bound_name=None,
+                closed_by="bounds",
+                status="optimal",
+            )
+        return 0, []
+
+    # sorted positions, largest item first (same order as exact_bin_packing)
+    order = sorted(range(n), key=items.__getitem__, reverse=True)
+    sorted_items = [items[i] for i in order]
+
+    ub, ub_assignment, ub_name = heuristic_upper_bound(items, L)
+    lb, lb_name = best_lower_bound(sorted_items, L, target=ub)
+
+    if info is not None:
+        info.update(
+            lower_bound=lb,
+            lower_bound_name=lb_name,
+            upper_bound=ub,
+            upper_bound_name=ub_name,
+            closed_by="bounds" if lb >= ub else "search",
+            status="optimal",
+            tasks=0,
+            workers=workers,
+            split_depth=0,
+        )
+
+    best_k = None
+    best_assignment = None
+    timed_out = False
+
+    if lb < ub:
+        if split_depth is None:
+            # deep splits are searched serially here, so stop at half the items
+            split_depth = 1
+            max_depth = max(1, n // 2)
+            while (
+                split_depth < max_depth
+                and len(_split(sorted_items, lb, L, split_depth)) < 4 * workers
+            ):
+                split_depth += 1
+        split_depth = min(split_depth, n)
+
+        tasks = []
+        pending = {}
+        for k in range(lb, ub):
+            prefixes = _split(sorted_items, k, L, split_depth)
+            pending[k] = len(prefixes)
+            for bins_remaining, prefix in prefixes:
+                tasks.append((k, split_depth, bins_remaining, prefix, deadline, cache_size))
+
+        found_k = multiprocessing.Value("i", ub)
+        infeasible_k = multiprocessing.Value("i", lb - 1)
+        # k whose subtrees all failed so far (a None result means undecided)
+        all_failed = {k: True for k in pending}
+        # k that cannot even place the first split_depth items
+        for k in range(lb, ub):
+            if pending[k] == 0:
+                infeasible_k.value = max(infeasible_k.value, k)
+
+        def finished():
+            if infeasible_k.value >= ub - 1:
+                return True
+            return best_k is not None and infeasible_k.value >= best_k - 1
+
+        if tasks and not finished():
+            pool = multiprocessing.Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(sorted_items, found_k, infeasible_k),
+            )
+            try:
+                for k, found, assignment in pool.imap_unordered(_search_prefix, tasks):
+                    if found:
+                        if best_k is None or k < best_k:
+                            best_k, best_assignment = k, assignment
+                    elif found is None and infeasible_k.value < k:
+                        # gave up without an answer: k is not proven infeasible
+                        all_failed[k] = False
+                        if found_k.value > k:
+                            # out of time, k stays undecided
+                            timed_out = True
+                    pending[k] -= 1
+                    if pending[k] == 0 and all_failed[k]:
+                        # k proven infeasible, so is everything below it
+                        with infeasible_k.get_lock():
+                            infeasible_k.value = max(infeasible_k.value, k)
+                    if finished():
+                        break
+            finally:
+                # cancel whatever is still running
+                pool.terminate()
+                pool.join()
+
+        if finished():
+            timed_out = False
+        lb = max(lb, infeasible_k.value + 1)
+        if best_k is not None:
+            lb = min(lb, best_k)
+        lb_name = "search"
+
+        if info is not None:
+            info.update(tasks=len(tasks), split_depth=split_depth)
+
+    if info is not None:
+        info["status"] = "feasible" if timed_out else "optimal"
+        info["lower_bound"] = best_k if best_k is not None and not timed_out else min(lb, ub)
+        info["lower_bound_name"] = lb_name
+
+    if best_k is None:
+        # no k < ub works (or lb == ub), the heuristic packing is optimal
+        return ub, assignment_to_bins(ub_assignment, ub)
+
+    bins = [[] for _ in range(best_k)]
+    for pos in range(n):
+        bins[best_assignment[pos]].append(order[pos])
+    return best_k, bins
@@ -0,0 +1,84 @@
+import multiprocessing
+import queue
+import time
+
+
+def _portfolio_worker(name, solver, items, L, time_limit, results):
+    """
+    Run one exact solver and send (name, num_bins, placement, info, seconds).
+    Errors are sent back too, so race_solvers never waits for a dead worker.
+    """
+    info = {}
+    t0 = time.perf_counter()
+    try:
+        num_bins, placement = solver(items, L, info=info, time_limit=time_limit)
+    except Exception as e:
+        num_bins, placement = None, None
+        info = {"status": "error", "error": repr(e)}
+    results.put((name, num_bins, placement, info, time.perf_counter() - t0))
+
+
+def race_solvers(items, L, solvers, time_limit=None):
+    """
+    Start every exact solver on the same instance at once, one process each,
+    and keep the first proven-optimal answer; the other processes are
+    terminated as soon as it arrives.
+
+    solvers: {name: solver}, solvers take (items, L, info=None, time_limit=None)
+    and return (num_bins, placement) like EXACT_SOLVERS in run_experiment.
+
+    Returns (winner, results, errors):
+        winner  - name of the first solver with info["status"] == "optimal",
+                  None if none of them proved optimality (e.g. time_limit)
+        results - {name: (num_bins, placement, info, seconds)} for every
+                  solver that finished, the winner included
+        errors  - {name: repr of the exception} for every solver that raised
+    """
+    results = {}
+    errors = {}
+    if not solvers:
+        return None, results, errors
+
+    inbox = multiprocessing.Queue()
+    workers = {}
+    for name, solver in solvers.items():
+        workers[name] = multiprocessing.Process(
+            target=_portfolio_worker,
+            args=(name, solver, items, L, time_limit, inbox),
+            daemon=True,
+        )
+    for worker in workers.values():
+        worker.start()
+
+    winner = None
+    finished = 0
+    try:
+        while winner is None and finished < len(workers):
+            try:
+                name, num_bins, placement, info, seconds = inbox.get(timeout=0.1)
+            except queue.Empty:
+                if any(w.is_alive() for w in workers.values()):
+                    continue
+                # every worker is gone, take whatever was still in flight
+                try:
+                    name, num_bins, placement, info, seconds = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    break
+            finished += 1
+            if num_bins is None:
+                # the solver raised, the others may still win
+                errors[name] = info["error"]
+                continue
+            results[name] = (num_bins, placement, info, seconds)
+            if info.get("status") == "optimal":
+                winner = name
+    finally:
+        # cancel the losers
+        for worker in workers.values():
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers.values():
+            worker.join()
+        inbox.close()
+
+    return winner, results, errors
@@ -0,0 +1,138 @@
+def _subset_sums(counts, limit):
+    """
+    Bitset of the subset sums <= limit reachable with the given multiset
+    (counts[s] items of size s). Bit t is set if some subset sums to t.
+    Bounded multiplicities are split into powers of two.
+    """
+    mask = (1 << (limit + 1)) - 1
+    reachable = 1
+    for size, count in enumerate(counts):
+        if count == 0 or size == 0 or size > limit:
+            continue
+        chunk = 1
+        while count > 0:
+            take = min(chunk, count)
+            reachable = (reachable | (reachable << (size * take))) & mask
+            count -= take
+            chunk *= 2
+    return reachable
+
+
+def fix_dominated_bins(items, L):
+    """
+    Martello-Toth style dominance reduction.
+
+    Items are tried from the largest to the smallest (sizes must be in 0..L).
+    For item j with free space c = L - w_j left in its bin:
+      - if no other item fits into c, j gets a bin of its own;
+      - otherwise let k be the largest other item that fits. If no subset of
+        the other items fills c better than k alone (max subset sum <= c is w_k),
+        then every bin holding j can swap its other items for k, so the bin
+        {j, k} is part of some optimal packing.
+    Fixed bins are removed and the next item is tried.
+    Zero-size items take no room, so they are left out of the reduction (they
+    would count as partners that fill nothing) and afterwards go into the
+    first fixed bin, or stay in the residual if no bin was fixed.
+
+    Returns (fixed_bins, residual) where fixed_bins is a list of bins, each a list
+    of positions into items, and residual the positions of the items left over
+    (largest first).
+    OPT(items) == len(fixed_bins) + OPT(residual).
+    """
+    # free items grouped by size: counts[s] of them, positions[s] says which ones
+    counts = [0] * (L + 1)
+    positions = [[] for _ in range(L + 1)]
+    for i, w in enumerate(items):
+        if w < 0 or w > L:
+            raise ValueError(f"item size {w} is outside 0..{L}")
+        counts[w] += 1
+        positions[w].append(i)
+
+    # zero-size items wait outside until the reduction is done
+    zeros = positions[0]
+    positions[0] = []
+    counts[0] = 0
+
+    fixed_bins = []
+    # items of one size are interchangeable: once one of them cannot be
+    # fixed, none of the others can either
+    for w in range(L, 0, -1):
+        while counts[w]:
+            counts[w] -= 1
+            room = L - w
+
+            # largest other item that fits
+            k_size = room
+            while k_size > 0 and counts[k_size] == 0:
+                k_size -= 1
+
+            if k_size == 0:
+                fixed_bins.append([positions[w].pop()])
+                continue
+
+            best_fill = _subset_sums(counts, room).bit_length() - 1
+            if best_fill == k_size:
+                j = positions[w].pop()
+                counts[k_size] -= 1
+                fixed_bins.append([j, positions[k_size].pop()])
+                continue
+
+            # this size cannot be fixed, put the item back
+            counts[w] += 1
+            break
+
+    if fixed_bins:
+        fixed_bins[0].extend(zeros)
+        zeros = []
+
+    residual = []
+    for w in range(L, 0, -1):
+        residual.extend(positions[w])
+    residual.extend(zeros)
+    return fixed_bins, residual
+
+
+def solve_reduced(solver, items, L, info=None, **kwargs):
+    """
+    Run an exact solver on the reduced instance only.
+
+    fix_dominated_bins fixes the bins of items that provably get a bin of
+    their own (nothing else fits next to them, e.g. items > L/2 without a
+    partner) and of pairs that provably share one (e.g. exact complements
+    w_j + w_k = L), the solver only sees the residual items.
+
+    solver: any exact solver (exact_bin_packing, mip_bin_packing, ...), called as
+    solver(residual_items, L, info=..., **kwargs).
+    The fixed bins are added back to its packing, so the result is
+    (num_bins, placement) for items, placement[b] lists original item
+    indices, the same as calling the solver on items directly.
+
+    info: the solver's info for the residual instance, with lower_bound /
+    upper_bound shifted by the fixed bins, plus
+        reduced_bins - bins fixed by the reduction
+        reduced_items - items in those bins
+        residual_n   - items left for the solver
+    """
+    fixed_bins, residual = fix_dominated_bins(items, L)
+
+    solver_info = {}
+    residual_bins, residual_placement = solver(
+        [items[i] for i in residual], L, info=solver_info, **kwargs
+    )
+
+    placement = [list(b) for b in fixed_bins]
+    for b in residual_placement:
+        placement.append([residual[p] for p in b])
+
+    if info is not None:
+        info.update(solver_info)
+        for key in ("lower_bound", "upper_bound"):
+            if info.get(key) is not None:
+                info[key] += len(fixed_bins)
+        info.update(
+            reduced_bins=len(fixed_bins),
+            reduced_items=len(items) - len(residual),
+            residual_n=len(residual),
+        )
+
+    return len(fixed_bins) + residual_bins, placement
@@ -1,41 +1,143 @@
 import os
 import time
 import csv
+import multiprocessing
+import random
+from functools import partial
 
 from algorithms import (
     next_fit,
     first_fit,
+    first_fit_tree,
     best_fit,
+    best_fit_indexed,
     first_fit_decreasing,
     best_fit_decreasing,
+    harmonic_k,
+    refined_harmonic,
     exact_bin_packing,
     mip_bin_packing,
+    arcflow_bin_packing,
+    cpsat_bin_packing,
+    count_dp_bin_packing,
 )
+from bounds import lower_bounds_np
+from parallel_exact import parallel_exact_bin_packing
+from portfolio import race_solvers
+from reductions import solve_reduced
 
 ALGO_RESULTS_CSV = "visualization/algo_results.csv"
 SOLVER_RESULTS_CSV = "visualization/solver_results.csv"
+# exact results shared between runs, see opt_cache.py
+OPT_CACHE_DB = "visualization/opt_cache.sqlite"
+
+# Every heuristic run_experiment can run, keyed by the name written to the CSV.
+# The *_tree / *_indexed entries give exactly the same bins as FF / BF / FFD / BFD,
+# they only find the target bin faster on large n.
+HEURISTIC_ALGOS = {
+    "NF": next_fit,
+    "FF": first_fit,
+    "BF": best_fit,
+    "FFD": first_fit_decreasing,
+    "BFD": best_fit_decreasing,
+    "FF_tree": first_fit_tree,
+    "BF_indexed": best_fit_indexed,
+    "FFD_tree": partial(first_fit_decreasing, engine="tree"),
+    "BFD_indexed": partial(best_fit_decreasing, engine="indexed"),
+    # bounded-space online algorithms, O(1) per item like NF
+    "Harmonic_10": partial(harmonic_k, k=10),
+    "RH": refined_harmonic,
+}
+
+# Heuristics run when the caller does not pick any
+DEFAULT_HEURISTICS = ["NF", "FF", "BF", "FFD", "BFD"]
+
+# Every exact solver run_experiment can run, keyed by the name written to the CSV.
+# All of them take (items, L, info=None, time_limit=None) and return (num_bins, placement).
+EXACT_SOLVERS = {
+    "my_own_exact_solver": exact_bin_packing,
+    "MIP": mip_bin_packing,
+    "arc_flow": arcflow_bin_packing,
+    # multi-worker CP-SAT, all cores unless run_experiment(..., cpsat_workers=k)
+    "CP-SAT": cpsat_bin_packing,
+    # DP over item-count vectors, polynomial in n for a small L
+    "count_dp": count_dp_bin_packing,
+    # my_own_exact_solver split over a process pool (all cores by default),
+    # not usable with exact_mode="portfolio" (its workers cannot have children)
+    "parallel_exact": parallel_exact_bin_packing,
+}
+
+# Exact solvers run when the caller does not pick any (MIP only up to mip_threshold)
+DEFAULT_EXACT_SOLVERS = ["my_own_exact_solver", "MIP"]
+
+# How the exact solvers of one trial are run:
+#   "verify"    - one after another, every result is kept and
+#                 my_own_exact_solver / MIP are cross-checked
+#   "portfolio" - all at once in worker processes (portfolio.race_solvers),
+#                 the first proven optimum wins and the others are cancelled
+EXACT_MODES = ("verify", "portfolio")
+
+# Exact solver used for n > exact_threshold when L <= dp_max_L and no solvers are given
+LARGE_N_EXACT_SOLVER = "count_dp"
+
+# Batched (numpy) counterpart of each heuristic, used when batched=True,
+# as its key in batched.BATCH_ALGOS. They return the same bin counts,
+# vectorized across all trials of a grid cell.
+# batched.py (and numpy) is only imported once a batched run starts.
+BATCHED_HEURISTICS = {
+    "NF": "NF",
+    "FF": "FF",
+    "BF": "BF",
+    "FFD": "FFD",
+    "BFD": "BFD",
+    "FF_tree": "FF",
+    "BF_indexed": "BF",
+    "FFD_tree": "FFD",
+    "BFD_indexed": "BFD",
+}
+
+
+ALGO_RESULTS_HEADER = [
+    "dist",
+    "n",
+    "L",
+    "trials",
+    "algo",
+    "avg_bins",
+    "avg_time_ms",
+    "avg_ratio",
+    "ratio_vs_lb",
+]
+
+
+def _upgrade_algo_csv():
+    # files written before ratio_vs_lb existed get an empty column for their old rows
+    with open(ALGO_RESULTS_CSV, newline="") as f:
+        header = next(csv.reader(f), None)
+    if header is None or header == ALGO_RESULTS_HEADER:
+        return
+    with open(ALGO_RESULTS_CSV, newline="") as f:
+        rows = list(csv.reader(f))
+    with open(ALGO_RESULTS_CSV, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(ALGO_RESULTS_HEADER)
+        for row in rows[1:]:
+            writer.writerow(row + [""] * (len(ALGO_RESULTS_HEADER) - len(row)))
 
 
-def _append_algo_row(dist, n, L, trials, algo, avg_bins, avg_time_ms, avg_ratio):
+def _append_algo_row(
+    dist, n, L, trials, algo, avg_bins, avg_time_ms, avg_ratio, ratio_vs_lb=None
+):
     # if file does not exist or file is empty, write header
     file_exists = (
         os.path.exists(ALGO_RESULTS_CSV) and os.path.getsize(ALGO_RESULTS_CSV) > 0
     )
+    if file_exists:
+        _upgrade_algo_csv()
     with open(ALGO_RESULTS_CSV, "a", newline="") as f:
         writer = csv.writer(f)
         if not file_exists:
-            writer.writerow(
-                [
-                    "dist",
-                    "n",
-                    "L",
-                    "trials",
-                    "algo",
-                    "avg_bins",
-                    "avg_time_ms",
-                    "avg_ratio",
-                ]
-            )
+            writer.writerow(ALGO_RESULTS_HEADER)
         writer.writerow(
             [
                 dist,
@@ -46,6 +148,7 @@ def _append_algo_row(dist, n, L, trials, algo, avg_bins, avg_time_ms, avg_ratio)
                 avg_bins,
                 avg_time_ms,
                 "" if avg_ratio is None else avg_ratio,
+                "" if ratio_vs_lb is None else ratio_vs_lb,
             ]
         )
 
@@ -73,6 +176,217 @@ def _append_solver_row(dist, n, L, trials, solver, avg_bins, avg_time_ms):
         )
 
 
+def _trial_seed(seed, t):
+    # seed of trial t: the same in any process and at any pool size
+    return f"{seed}:{t}"
+
+
+def _run_trial(config, t):
+    """
+    One trial of run_experiment: generate (or read) the instance, get OPT
+    (opt_cache or the exact solvers), run the heuristics.
+    config: the settings run_experiment builds, see there.
+
+    With config["seed"] set, the global random is seeded with
+    _trial_seed(seed, t) first, so trial t draws the same instance serially
+    and in any pool worker.
+
+    Returns a record of plain values for run_experiment to merge:
+        items        - the instance (batched mode only, else None)
+        lb_bins      - L2 lower bound, None if it is 0
+        opt_bins     - OPT (or best proven bound), None if exact was not run
+        cached       - OPT came from opt_cache
+        exact        - {solver: (num_bins, seconds, closed_by_bounds)}
+        residual_n   - items left after the reduction, None if not reduced
+        num_items    - items in the instance (n counts bins for perfect packing)
+        winner       - portfolio mode: first solver with a proven optimum
+        race_seconds - portfolio mode: wall time of the race
+        unproven     - no solver proved optimality within time_limit
+        mismatch     - (my_own bins, MIP bins, items) if they disagree, else None
+        errors       - portfolio mode: {solver: error} of the solvers that raised
+        heuristics   - {algo: (num_bins, seconds)} (empty in batched mode)
+    """
+    generator = config["generator"]
+    n = config["n"]
+    L = config["L"]
+    run_exact = config["run_exact"]
+    opt_cache = config["opt_cache"]
+
+    if config["corpus_indices"] is not None:
+        items = generator.items(config["corpus_indices"][t])
+    else:
+        if config["seed"] is not None:
+            random.seed(_trial_seed(config["seed"], t))
+        items = generator(n, L)
+
+    record = {
+        "items": items if config["batched"] else None,
+        "lb_bins": None,
+        "opt_bins": None,
+        "cached": False,
+        "exact": {},
+        "residual_n": None,
+        "num_items": len(items),
+        "winner": None,
+        "race_seconds": None,
+        "unproven": False,
+        "mismatch": None,
+        "errors": {},
+        "heuristics": {},
+    }
+
+    opt_bins = None
+
+    # L2 lower bound, vectorized so it is cheap even for n = 10^6
+    _, lb_bins = lower_bounds_np(items, L)
+    if lb_bins > 0:
+        record["lb_bins"] = lb_bins
+    else:
+        lb_bins = None
+
+    cached = None
+    if run_exact and opt_cache is not None:
+        cached = opt_cache.get(items, L)
+        if cached is not None and cached["status"] != "optimal":
+            # only a bound, solve again
+            cached = None
+
+    if cached is not None:
+        opt_bins = cached["opt"]
+        record["cached"] = True
+
+    elif run_exact:
+        # Run exact solutions once for THIS input
+        per_input_bins = {}
+        per_input_optimal = {}
+        best_lower_bound = 0
+        # best packing over all solvers, for opt_cache
+        best_result = None
+
+        # finished[name] = (num_bins, placement, info, seconds)
+        if config["exact_mode"] == "portfolio":
+            t0 = time.perf_counter()
+            winner, finished, record["errors"] = race_solvers(
+                items, L, config["exact_solvers"], time_limit=config["time_limit"]
+            )
+            record["race_seconds"] = time.perf_counter() - t0
+            record["winner"] = winner
+        else:
+            finished = {}
+            for solver_name, solver in config["exact_solvers"].items():
+                solver_info = {}
+                t0 = time.perf_counter()
+                solver_bins, solver_placement = solver(
+                    items, L, info=solver_info, time_limit=config["time_limit"]
+                )
+                t1 = time.perf_counter()
+                finished[solver_name] = (
+                    solver_bins,
+                    solver_placement,
+                    solver_info,
+                    t1 - t0,
+                )
+
+        # every solver saw the same reduction, take it from any of them
+        for _, _, solver_info, _ in finished.values():
+            if "residual_n" in solver_info:
+                record["residual_n"] = solver_info["residual_n"]
+                break
+
+        for solver_name, result in finished.items():
+            solver_bins, solver_placement, solver_info, seconds = result
+            record["exact"][solver_name] = (
+                solver_bins,
+                seconds,
+                solver_info.get("closed_by") == "bounds",
+            )
+
+            # per-input record
+            per_input_bins[solver_name] = solver_bins
+            per_input_optimal[solver_name] = solver_info["status"] == "optimal"
+            best_lower_bound = max(best_lower_bound, solver_info["lower_bound"])
+            if best_result is None or solver_bins < best_result[0]:
+                best_result = (solver_bins, solver_name, solver_placement)
+
+            # update OPT for this input
+            if per_input_optimal[solver_name]:
+                if opt_bins is None or solver_bins < opt_bins:
+                    opt_bins = solver_bins
+
+        if opt_cache is not None and best_result is not None:
+            proven = opt_bins is not None and opt_bins == best_result[0]
+            opt_cache.put(
+                items,
+                L,
+                best_result[0],
+                "optimal" if proven else "feasible",
+                best_result[0] if proven else best_lower_bound,
+                solver=best_result[1],
+                placement=best_result[2],
+            )
+
+        if opt_bins is None:
+            # nobody finished: compare against the best proven bound
+            # (or the instance's L2 bound if every solver failed, never 0)
+            opt_bins = max(best_lower_bound, lb_bins or 0)
+            if opt_bins == 0:
+                raise RuntimeError(
+                    f"no exact solver gave a bin count or bound, errors: {record['errors']}"
+                )
+            record["unproven"] = True
+
+        # check if two exact solvers agree on this input
+        if per_input_optimal.get("my_own_exact_solver") and per_input_optimal.get(
+            "MIP"
+        ):
+            n_my = per_input_bins["my_own_exact_solver"]
+            n_mip = per_input_bins["MIP"]
+            if n_my != n_mip:
+                record["mismatch"] = (n_my, n_mip, items)
+
+    record["opt_bins"] = opt_bins
+
+    if config["batched"]:
+        # heuristics run on all trials at once in run_experiment
+        return record
+
+    # Run all heuristics on the same input
+    for algo_name, algo in config["heuristics_algos"].items():
+        t0 = time.perf_counter()
+        # only the bin count is used here, so skip building any placement
+        bins_used, _ = algo(items, L, result="count")
+        t1 = time.perf_counter()
+        record["heuristics"][algo_name] = (bins_used, t1 - t0)
+
+    return record
+
+
+# set in every pool worker of run_experiment(..., workers=...) by _init_trial_worker
+_trial_config = None
+
+
+def _init_trial_worker(config):
+    global _trial_config
+    # with the fork start method config is the parent's own objects, not a
+    # pickled copy: open the cache and the corpus again here, a SQLite
+    # connection must not be used across fork()
+    config = dict(config)
+    if config["opt_cache"] is not None:
+        from opt_cache import OptCache
+
+        cache = config["opt_cache"]
+        config["opt_cache"] = OptCache(cache.path, cache.max_entries)
+    if config["corpus_indices"] is not None:
+        from corpus import Corpus
+
+        config["generator"] = Corpus(config["generator"].path)
+    _trial_config = config
+
+
+def _run_trial_in_worker(t):
+    return _run_trial(_trial_config, t)
+
+
 def run_experiment(
     name,
     generator,
@@ -80,42 +394,161 @@ def run_experiment(
     L,
     trials: int = 20,
     exact_threshold: int = 30,
-    mip_threshold: int = 12,
+    mip_threshold: int = 30,
+    heuristics=None,
+    batched: bool = False,
+    time_limit=None,
+    solvers=None,
+    dp_max_L: int = 10,
+    opt_cache=None,
+    exact_mode: str = "verify",
+    reduce_instances: bool = True,
+    seed=None,
+    workers: int = 1,
+    cpsat_workers=None,
 ):
     """
     Run experiments for one (input type, n, L).
 
     - If n <= exact_threshold:
         For each trial, run exact solvers once to get OPT for this input.
-        OPT is taken as the minimum number of bins among:
-            my_own_exact_solver (recursive exact)
+        OPT is taken as the minimum number of bins among the solvers that proved
+        optimality:
+            my_own_exact_solver (backtracking exact)
             MIP (OR-Tools MIP baseline, only if n <= mip_threshold)
-        We always check whether my_own_exact_solver and MIP agree when both are run.
+        If time_limit (seconds per solver call) stops every solver first, the best
+        proven lower bound is used instead, so ratios are upper bounds of the true
+        ones for those trials (their number is printed).
+        We always check whether my_own_exact_solver and MIP agree when both proved optimality.
         Compute avg_ratio = average( heuristic_bins / OPT ) across trials.
         Also record average runtime of each exact solver.
 
-    - If n > exact_threshold:
+    - If n > exact_threshold and L <= dp_max_L (and no solvers are given):
+        OPT comes from count_dp alone (DP over item-count vectors, polynomial in n
+        for a small L), so ratios are still exact, e.g. for n=200 at L=10.
+
+    - If n > exact_threshold and L > dp_max_L (and no solvers are given):
         Do not run exact.
         Only run the heuristics.
+
+    - For every n:
+        The L2 lower bound of each instance is computed with numpy (lower_bounds_np)
+        and ratio_vs_lb = average( heuristic_bins / L2 ) is written next to avg_ratio.
+        It is >= the true ratio, so large-n quality is still measured against a bound.
+
+    solvers: names from EXACT_SOLVERS to run, e.g. ["arc_flow"] alone for larger n.
+    A given list is used at any n, only "MIP" is skipped when n > mip_threshold.
+    Default: DEFAULT_EXACT_SOLVERS up to exact_threshold, above it
+    LARGE_N_EXACT_SOLVER if L <= dp_max_L, else none.
+
+    heuristics: names from HEURISTIC_ALGOS to run (default DEFAULT_HEURISTICS),
+    e.g. ["NF", "Harmonic_10", "RH", "FF_tree", "BF_indexed", "FFD_tree", "BFD_indexed"]
+    for large n.
+
+    opt_cache: optional OptCache (see opt_cache.py, e.g. OptCache(OPT_CACHE_DB)).
+    Every instance is looked up first, a cached proven optimum is used as OPT
+    without running any exact solver, new results are stored. Exact solver
+    averages are then taken over the trials actually solved.
+
+    exact_mode: "verify" (default) runs the exact solvers one after another and
+    cross-checks them, "portfolio" races them in processes and keeps the first
+    proven optimum (see EXACT_MODES). In portfolio mode the per-solver rows only
+    cover the runs that finished, the solver CSV gets a single "portfolio" row
+    (wall time of the race) and the wins of each solver are printed.
+
+    reduce_instances: fix the bins that provably belong to an optimal packing
+    (Martello-Toth dominance, reductions.solve_reduced) before any exact solver
+    runs, the solvers only search the residual items. How much the instances
+    shrank is printed with the exact solvers.
+
+    batched: generate all trials first and run each heuristic once on the whole
+    (trials, n) array (see batched.py) instead of once per trial.
+    Bin counts and ratios are the same, avg_time_ms is the batch time / trials.
+
+    generator: an input generator (n, L) -> items, or a Corpus (see corpus.py).
+    With a corpus the trials are its instances with exactly this n and L, in
+    corpus order (the first `trials` of them, all of them if trials is None),
+    so every run sees the same inputs.
+
+    seed: seed trial t with _trial_seed(seed, t) (the global random, which the
+    generators use), so every trial is reproducible on its own. None keeps the
+    old behaviour: trials continue the global random stream.
+
+    workers: spread the trials over a process pool of this size. Trials then
+    always get per-trial seeds (drawn from the global random if seed is None),
+    and their results are merged in trial order: bins, ratios, mismatches and
+    CSV rows are the same as a serial run with the same seed, only the times
+    differ. Every worker opens its own OptCache connection and Corpus mapping
+    on the same paths in _init_trial_worker (whatever the start method). With
+    a start method that pickles (spawn) generator must be picklable too
+    (module-level functions, partial).
+    Pool workers cannot start processes of their own, so exact_mode="portfolio"
+    and "parallel_exact" need workers=1.
+
+    cpsat_workers: search workers of every CP-SAT call (default: all cores).
+    Set it when CP-SAT shares the machine, e.g. with workers > 1 or in
+    portfolio mode.
     """
 
+    # Instances from a corpus instead of a generator
+    corpus_indices = None
+    if not callable(generator):
+        corpus_indices = generator.select(n=n, L=L)
+        if trials is not None:
+            corpus_indices = corpus_indices[:trials]
+        if not corpus_indices:
+            raise ValueError(f"corpus has no instance with n={n}, L={L}")
+        trials = len(corpus_indices)
+
+    if exact_mode == "portfolio" and "parallel_exact" in (solvers or []):
+        # its pool cannot start inside a (daemon) portfolio process
+        raise ValueError('exact_mode="portfolio" cannot run "parallel_exact"')
+    if workers > 1:
+        if exact_mode == "portfolio" or "parallel_exact" in (solvers or []):
+            raise ValueError(
+                'workers > 1 cannot run exact_mode="portfolio" or "parallel_exact"'
+            )
+        if seed is None:
+            # every worker must draw the instances a serial run would
+            seed = random.getrandbits(64)
+
     # Heuristic algorithms only
-    heuristics_algos = {
-        "NF": next_fit,
-        "FF": first_fit,
-        "BF": best_fit,
-        "FFD": first_fit_decreasing,
-        "BFD": best_fit_decreasing,
-    }
+    if heuristics is None:
+        heuristics = DEFAULT_HEURISTICS
+    unknown = [h for h in heuristics if h not in HEURISTIC_ALGOS]
+    if unknown:
+        raise ValueError(f"unknown heuristics: {unknown}")
+    heuristics_algos = {h: HEURISTIC_ALGOS[h] for h in heuristics}
+    if batched:
+        unknown = [h for h in heuristics if h not in BATCHED_HEURISTICS]
+        if unknown:
+            raise ValueError(f"no batched version of heuristics: {unknown}")
 
     # Exact solvers
-    # Always run my_own_exact_solver as the exact baseline.
-    exact_solvers = {
-        "my_own_exact_solver": exact_bin_packing,
-    }
-    # Only add MIP when n is small enough (n <= mip_threshold)
-    if n <= mip_threshold:
-        exact_solvers["MIP"] = mip_bin_packing
+    if exact_mode not in EXACT_MODES:
+        raise ValueError(f"unknown exact_mode {exact_mode!r}, expected one of {EXACT_MODES}")
+    if solvers is None:
+        if n <= exact_threshold:
+            solvers = DEFAULT_EXACT_SOLVERS
+        elif L <= dp_max_L:
+            solvers = [LARGE_N_EXACT_SOLVER]
+        else:
+            solvers = []
+    unknown = [s for s in solvers if s not in EXACT_SOLVERS]
+    if unknown:
+        raise ValueError(f"unknown exact solvers: {unknown}")
+    exact_solvers = {}
+    for solver_name in solvers:
+        # Only add MIP when n is small enough (n <= mip_threshold)
+        if solver_name == "MIP" and n > mip_threshold:
+            continue
+        solver = EXACT_SOLVERS[solver_name]
+        if solver_name == "CP-SAT" and cpsat_workers is not None:
+            solver = partial(solver, workers=cpsat_workers)
+        exact_solvers[solver_name] = solver
+        if reduce_instances:
+            exact_solvers[solver_name] = partial(solve_reduced, solver)
+    run_exact = bool(exact_solvers)
 
     # Stats for heuristics
     stats_bins = {k: 0 for k in heuristics_algos}  # total bins used
@@ -123,10 +556,20 @@ def run_experiment(
     stats_ratio = {
         k: 0.0 for k in heuristics_algos
     }  # sum of (bins_used / OPT) when OPT exists
+    # sum of (bins_used / LB), LB = L2 lower bound of every instance (any n)
+    stats_ratio_lb = {k: 0.0 for k in heuristics_algos}
+    lb_runs = 0
 
     # Stats for each exact solver
+    exact_stats_runs = {k: 0 for k in exact_solvers}  # trials solved (not cached)
     exact_stats_bins = {k: 0 for k in exact_solvers}  # total bins used
     exact_stats_time = {k: 0.0 for k in exact_solvers}  # total time (seconds)
+    # trials each exact solver closed with LB == UB, without any search
+    exact_stats_closed_by_bounds = {k: 0 for k in exact_solvers}
+
+    # portfolio mode: trials won by each solver and wall time of the races
+    portfolio_wins = {k: 0 for k in exact_solvers}
+    portfolio_time = 0.0
 
     # For reporting average OPT (min over exact solvers per trial)
     opt_total_bins = 0
@@ -135,66 +578,148 @@ def run_experiment(
     # Count mismatches between my_own_exact_solver and MIP
     exact_mismatch_count = 0
 
-    for _ in range(trials):
-        items = generator(n, L)
-
-        opt_bins = None
-
-        if n <= exact_threshold:
-            # Run exact solutions once for THIS input
-            per_input_bins = {}
-            per_input_time = {}
-
-            for solver_name, solver in exact_solvers.items():
-                t0 = time.perf_counter()
-                solver_bins, _ = solver(items, L)
-                t1 = time.perf_counter()
-
-                # accumulate stats for this exact solver
-                exact_stats_bins[solver_name] += solver_bins
-                exact_stats_time[solver_name] += t1 - t0
-
-                # per-input record
-                per_input_bins[solver_name] = solver_bins
-                per_input_time[solver_name] = t1 - t0
-
-                # update OPT for this input
-                if opt_bins is None or solver_bins < opt_bins:
-                    opt_bins = solver_bins
+    # Trials where no exact solver finished in time_limit (OPT = best proven bound)
+    unproven_trials = 0
+
+    # reduce_instances: items left for the exact solvers, summed over solved trials
+    residual_items = 0
+    reduced_trials = 0
+    # items of those trials before the reduction
+    reduced_trial_items = 0
+
+    # Trials whose OPT came from opt_cache
+    cached_trials = 0
+    cached_opt_bins = 0
+
+    # batched mode: every instance, its OPT (None if exact was not run) and LB
+    batch_instances = []
+    batch_opts = []
+    batch_lbs = []
+
+    config = {
+        "generator": generator,
+        "n": n,
+        "L": L,
+        "corpus_indices": corpus_indices,
+        "seed": seed,
+        "run_exact": run_exact,
+        "exact_solvers": exact_solvers,
+        "exact_mode": exact_mode,
+        "time_limit": time_limit,
+        "opt_cache": opt_cache,
+        "heuristics_algos": heuristics_algos,
+        "batched": batched,
+    }
 
-            # check if two exact solvers agree on this input
-            if "my_own_exact_solver" in per_input_bins and "MIP" in per_input_bins:
-                n_my = per_input_bins["my_own_exact_solver"]
-                n_mip = per_input_bins["MIP"]
-                if n_my != n_mip:
+    pool = None
+    random_state = None
+    if workers > 1:
+        pool = multiprocessing.Pool(
+            min(workers, trials), initializer=_init_trial_worker, initargs=(config,)
+        )
+        records = pool.imap(_run_trial_in_worker, range(trials))
+    else:
+        if seed is not None:
+            # seeded trials reseed the global random, leave it as it was afterwards
+            random_state = random.getstate()
+        records = (_run_trial(config, t) for t in range(trials))
+
+    try:
+        # merge in trial order, so every sum is taken in the same order as serially
+        for record in records:
+            opt_bins = record["opt_bins"]
+            lb_bins = record["lb_bins"]
+            if lb_bins is not None:
+                lb_runs += 1
+
+            if record["cached"]:
+                cached_trials += 1
+                cached_opt_bins += opt_bins
+                opt_total_bins += opt_bins
+                opt_runs += 1
+
+            elif run_exact:
+                for solver_name, error in record["errors"].items():
+                    print(f"[SOLVER ERROR] {solver_name}: {error}")
+
+                if exact_mode == "portfolio":
+                    portfolio_time += record["race_seconds"]
+                    if record["winner"] is not None:
+                        portfolio_wins[record["winner"]] += 1
+
+                if record["residual_n"] is not None:
+                    residual_items += record["residual_n"]
+                    reduced_trials += 1
+                    reduced_trial_items += record["num_items"]
+
+                for solver_name, result in record["exact"].items():
+                    solver_bins, seconds, closed_by_bounds = result
+                    # accumulate stats for this exact solver
+                    exact_stats_runs[solver_name] += 1
+                    exact_stats_bins[solver_name] += solver_bins
+                    exact_stats_time[solver_name] += seconds
+                    if closed_by_bounds:
+                        exact_stats_closed_by_bounds[solver_name] += 1
+
+                if record["unproven"]:
+                    unproven_trials += 1
+
+                if record["mismatch"] is not None:
+                    n_my, n_mip, items = record["mismatch"]
                     exact_mismatch_count += 1
                     print(
                         f"[MISMATCH] my_own_exact_solver={n_my}, "
                         f"MIP={n_mip}, items={items}"
                     )
 
-                # print(
-                #     f"[Exact vs MIP time] my_own={per_input_time['my_own_exact_solver']*1000:.2f}ms, "
-                #     f"MIP={per_input_time['MIP']*1000:.2f}ms"
-                # )
-
-            opt_total_bins += opt_bins
-            opt_runs += 1
-
-        # Run all heuristics on the same input
-        for algo_name, algo in heuristics_algos.items():
+                opt_total_bins += opt_bins
+                opt_runs += 1
+
+            if batched:
+                # heuristics run on all trials at once after this loop
+                batch_instances.append(record["items"])
+                batch_opts.append(opt_bins)
+                batch_lbs.append(lb_bins)
+                continue
+
+            for algo_name, (bins_used, seconds) in record["heuristics"].items():
+                stats_bins[algo_name] += bins_used
+                stats_time[algo_name] += seconds
+
+                if opt_bins is not None:
+                    stats_ratio[algo_name] += bins_used / opt_bins
+                if lb_bins is not None:
+                    stats_ratio_lb[algo_name] += bins_used / lb_bins
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        if random_state is not None:
+            random.setstate(random_state)
+
+    if batched:
+        from batched import BATCH_ALGOS, pad_instances
+
+        batch = pad_instances(batch_instances)
+        for algo_name in heuristics_algos:
             t0 = time.perf_counter()
-            bins_used, _ = algo(items, L)
+            bins_per_trial = BATCH_ALGOS[BATCHED_HEURISTICS[algo_name]](batch, L)
             t1 = time.perf_counter()
 
-            stats_bins[algo_name] += bins_used
             stats_time[algo_name] += t1 - t0
-
-            if opt_bins is not None:
-                stats_ratio[algo_name] += bins_used / opt_bins
+            for bins_used, opt_bins, lb_bins in zip(
+                bins_per_trial.tolist(), batch_opts, batch_lbs
+            ):
+                stats_bins[algo_name] += bins_used
+                if opt_bins is not None:
+                    stats_ratio[algo_name] += bins_used / opt_bins
+                if lb_bins is not None:
+                    stats_ratio_lb[algo_name] += bins_used / lb_bins
 
     print(f"\n=== Experiment: {name}, n={n}, L={L}, trials={trials} ===")
-    print(f"{'Algo':<10} {'avg_bins':>10} {'avg_time(ms)':>14} {'avg_ratio':>10}")
+    print(
+        f"{'Algo':<12} {'avg_bins':>10} {'avg_time(ms)':>14} {'avg_ratio':>10} {'ratio_vs_lb':>12}"
+    )
 
     # Heuristics summary
     for algo_name in heuristics_algos:
@@ -203,34 +728,89 @@ def run_experiment(
 
         avg_ratio = None
 
-        if n <= exact_threshold and opt_runs > 0:
+        if run_exact and opt_runs > 0:
             avg_ratio = stats_ratio[algo_name] / opt_runs
             ratio_str = f"{avg_ratio:.8f}"
         else:
             ratio_str = "-"
 
-        print(f"{algo_name:<10} {avg_bins:10.8f} {avg_time_ms:14.3f} {ratio_str:>10}")
+        # bins / L2 lower bound, an upper bound of the true ratio, reported for any n
+        ratio_vs_lb = None
+        lb_str = "-"
+        if lb_runs > 0:
+            ratio_vs_lb = stats_ratio_lb[algo_name] / lb_runs
+            lb_str = f"{ratio_vs_lb:.8f}"
+
+        print(
+            f"{algo_name:<12} {avg_bins:10.8f} {avg_time_ms:14.3f} {ratio_str:>10} {lb_str:>12}"
+        )
         _append_algo_row(
-            name, n, L, trials, algo_name, avg_bins, avg_time_ms, avg_ratio
+            name, n, L, trials, algo_name, avg_bins, avg_time_ms, avg_ratio, ratio_vs_lb
         )
 
     # Exact solvers summary
-    if n <= exact_threshold and opt_runs > 0:
+    if run_exact and opt_runs > 0:
         print("\nExact solvers:")
-        print(f"{'Solver':<20} {'avg_bins':>10} {'avg_time(ms)':>14}")
+        print(
+            f"{'Solver':<20} {'avg_bins':>10} {'avg_time(ms)':>14} {'closed_by_bounds':>17}"
+        )
 
         for solver_name in exact_solvers:
-            avg_exact_bins = exact_stats_bins[solver_name] / trials
-            avg_exact_time_ms = exact_stats_time[solver_name] * 1000.0 / trials
-            print(f"{solver_name:<20} {avg_exact_bins:10.8f} {avg_exact_time_ms:14.3f}")
+            runs = exact_stats_runs[solver_name]
+            if runs == 0:
+                # every trial came from opt_cache
+                continue
+            avg_exact_bins = exact_stats_bins[solver_name] / runs
+            avg_exact_time_ms = exact_stats_time[solver_name] * 1000.0 / runs
+            closed = f"{exact_stats_closed_by_bounds[solver_name]}/{runs}"
+            print(
+                f"{solver_name:<20} {avg_exact_bins:10.8f} {avg_exact_time_ms:14.3f} {closed:>17}"
+            )
+            if exact_mode == "verify":
+                _append_solver_row(
+                    name, n, L, trials, solver_name, avg_exact_bins, avg_exact_time_ms
+                )
+
+        raced = opt_runs - cached_trials
+        if exact_mode == "portfolio" and raced > 0:
+            avg_race_time_ms = portfolio_time * 1000.0 / raced
+            print(f"{'portfolio':<20} {'':>10} {avg_race_time_ms:14.3f}")
+            wins = ", ".join(f"{k}={v}" for k, v in portfolio_wins.items())
+            print(f"portfolio wins: {wins}")
+            # avg_bins of the race: OPT of the trials that were raced
             _append_solver_row(
-                name, n, L, trials, solver_name, avg_exact_bins, avg_exact_time_ms
+                name,
+                n,
+                L,
+                trials,
+                "portfolio",
+                (opt_total_bins - cached_opt_bins) / raced,
+                avg_race_time_ms,
             )
 
         avg_opt = opt_total_bins / opt_runs
         print(f"\nEstimated OPT (min over exact solvers) avg_bins = {avg_opt:.8f}")
+        if opt_cache is not None:
+            print(f"OPT cache: {cached_trials}/{opt_runs} trials hit")
+        if reduced_trials:
+            avg_residual = residual_items / reduced_trials
+            # average instance size, not n (perfect packing's n is its bin count)
+            avg_items = reduced_trial_items / reduced_trials
+            fixed_share = 1 - residual_items / max(reduced_trial_items, 1)
+            print(
+                f"Reduction: avg residual n = {avg_residual:.2f} of {avg_items:.2f} "
+                f"({100.0 * fixed_share:.1f}% of the items in fixed bins)"
+            )
+        if unproven_trials:
+            print(
+                f"{unproven_trials}/{opt_runs} trials without a proven optimum "
+                f"(time_limit or solver errors), OPT there is the best proven lower bound"
+            )
 
-        if "MIP" in exact_solvers:
+        # cached trials ran no solver, so there is only something to compare
+        # if at least one trial was solved in this run
+        solved_here = opt_runs - cached_trials > 0
+        if exact_mode == "verify" and "MIP" in exact_solvers and solved_here:
             if exact_mismatch_count == 0:
                 print("my_own_exact_solver vs MIP: all trials matched in #bins")
             else:
@@ -0,0 +1,113 @@
+import itertools
+
+import numpy as np
+
+from batch_generators import BATCH_GENERATORS
+
+# Default items per chunk: large enough that numpy does the work,
+# small enough that a chunk stays in cache-sized memory (512 KB of int64)
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class ItemStream:
+    """
+    Unbounded (or very long) seeded item stream, generated in chunks.
+
+    generator: a generator of input_generators.py (or its name), the items
+    follow the same distribution. Chunk k is drawn from its own
+    SeedSequence(seed, spawn_key=(k,)), so memory is one chunk whatever the
+    length, and the stream can be resumed at any chunk from state() alone:
+        stream = ItemStream(random_uniform, L=100, seed=1)
+        ...
+        saved = stream.state()
+        later = ItemStream.from_state(saved)   # continues with the next chunk
+    Chunk k is also row k of the batch_generators.py batch with the same
+    seed and per_trial=True.
+
+    total: number of items (None: never ends). For random_perfect_packing
+    total and chunk_size count bins instead of items, every chunk then
+    perfectly packs into chunk_size bins.
+
+    Iterating gives plain ints, so a stream goes straight into next_fit /
+    first_fit / best_fit (result="count") or Packer.feed; chunks() gives the
+    numpy arrays themselves.
+    """
+
+    def __init__(
+        self,
+        generator,
+        L,
+        total=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        seed=None,
+        start_chunk=0,
+    ):
+        name = generator if isinstance(generator, str) else generator.__name__
+        if name not in BATCH_GENERATORS:
+            raise ValueError(f"no streaming version of generator {name!r}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if isinstance(seed, np.random.SeedSequence):
+            seed = seed.entropy
+        if seed is None:
+            # fresh entropy, kept so that state() can resume the stream
+            seed = np.random.SeedSequence().entropy
+
+        self.generator = name
+        self.L = L
+        self.total = total
+        self.chunk_size = chunk_size
+        self.seed = seed
+        # index of the next chunk to generate
+        self.chunk = start_chunk
+
+    def state(self):
+        """
+        Everything needed to resume the stream after the chunks generated so
+        far (a JSON-serializable dict, see from_state). When iterating items,
+        save it between chunks: mid-chunk it already points past the current one.
+        """
+        return {
+            "generator": self.generator,
+            "L": self.L,
+            "total": self.total,
+            "chunk_size": self.chunk_size,
+            "seed": self.seed,
+            "chunk": self.chunk,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(
+            state["generator"],
+            state["L"],
+            total=state["total"],
+            chunk_size=state["chunk_size"],
+            seed=state["seed"],
+            start_chunk=state["chunk"],
+        )
+
+    def _draw(self, k, size):
+        batch = BATCH_GENERATORS[self.generator](
+            1, size, self.L, seed=np.random.SeedSequence(self.seed, spawn_key=(k,))
+        )
+        return batch[0]
+
+    def chunks(self):
+        """
+        Yield the remaining chunks as int64 arrays (the last one may be
+        shorter). Perfect-packing chunks are not zero padded.
+        """
+        while self.total is None or self.chunk * self.chunk_size < self.total:
+            size = self.chunk_size
+            if self.total is not None:
+                size = min(size, self.total - self.chunk * self.chunk_size)
+            chunk = self._draw(self.chunk, size)
+            if self.generator == "random_perfect_packing":
+                chunk = chunk[chunk > 0]
+            self.chunk += 1
+            yield chunk
+
+    def __iter__(self):
+        # chunk.tolist() gives Python ints, much faster to pack than numpy scalars
+        return itertools.chain.from_iterable(chunk.tolist() for chunk in self.chunks())
@@ -0,0 +1,16 @@
+import random
+
+from algorithms import exact_bin_packing
+from bounds import best_lower_bound, lower_bound_l3
+
+
+def test_l3_with_zero_size_items_is_a_lower_bound():
+    assert lower_bound_l3([0, 0, 0], 1) <= 1
+    rng = random.Random(6)
+    for _ in range(500):
+        L = rng.randint(1, 12)
+        items = [rng.choice([0, rng.randint(0, L)]) for _ in range(rng.randint(1, 10))]
+        opt, _ = exact_bin_packing(items, L)
+        assert lower_bound_l3(items, L) <= opt, (items, L)
+        lb, _ = best_lower_bound(sorted(items, reverse=True), L)
+        assert lb <= opt, (items, L)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from algorithms import best_fit, first_fit, next_fit
+from packer import Packer
+
+
+def _pack_chunks(algo, chunks, L, max_open_bins=None):
+    packer = Packer(L, algo, max_open_bins=max_open_bins)
+    closed = list(packer.feed_chunks(chunks))
+    closed.extend(packer.flush())
+    return packer, closed
+
+
+def test_feed_chunks_matches_the_heuristics():
+    rng = np.random.default_rng(17)
+    L = 20
+    chunks = [rng.integers(1, L, size=size, endpoint=True) for size in (50, 1, 0, 73)]
+    items = np.concatenate(chunks).tolist()
+    for algo, heuristic in (("NF", next_fit), ("FF", first_fit), ("BF", best_fit)):
+        packer, closed = _pack_chunks(algo, chunks, L)
+        assert packer.num_bins == heuristic(items, L, result="count")[0]
+        assert packer.num_items == len(items)
+        assert sorted(x for _, sizes in closed for x in sizes) == sorted(items)
+
+
+def test_feed_chunks_with_bounded_open_bins():
+    rng = np.random.default_rng(3)
+    chunks = [rng.integers(1, 10, size=100, endpoint=True) for _ in range(5)]
+    packer, closed = _pack_chunks("FF", iter(chunks), 10, max_open_bins=2)
+    assert packer.num_open == 0
+    assert len(closed) == packer.num_bins
+    for _, sizes in closed:
+        assert sum(sizes) <= 10
+
+
+def test_zero_size_items_do_not_open_a_bin():
+    for algo, heuristic in (("NF", next_fit), ("FF", first_fit), ("BF", best_fit)):
+        for items in ([10, 0], [10, 0, 5, 5, 0], [0, 10, 0, 0, 3]):
+            packer, closed = _pack_chunks(algo, [items], 10)
+            assert packer.num_bins == heuristic(items, 10, result="count")[0], (algo, items)
+            assert sorted(x for _, sizes in closed for x in sizes) == sorted(items)
@@ -0,0 +1,40 @@
+import random
+
+from algorithms import exact_bin_packing
+from reductions import fix_dominated_bins, solve_reduced
+
+
+def _check_packing(items, L, num_bins, placement):
+    assert len(placement) == num_bins
+    assert sorted(i for b in placement for i in b) == list(range(len(items)))
+    for b in placement:
+        assert sum(items[i] for i in b) <= L
+
+
+def test_zero_size_items_are_not_fixed_alone():
+    # zeros used to be paired with each other / given bins of their own
+    assert fix_dominated_bins([0, 0, 0], 1) == ([], [0, 1, 2])
+    num_bins, placement = solve_reduced(exact_bin_packing, [0, 0, 0], 1)
+    assert num_bins == 1
+    _check_packing([0, 0, 0], 1, num_bins, placement)
+
+
+def test_zero_size_items_join_a_fixed_bin():
+    items = [3, 0, 7, 5, 0]
+    fixed_bins, residual = fix_dominated_bins(items, 10)
+    assert sorted(i for b in fixed_bins for i in b) + residual == [0, 1, 2, 3, 4]
+    num_bins, placement = solve_reduced(exact_bin_packing, items, 10)
+    assert num_bins == 2
+    _check_packing(items, 10, num_bins, placement)
+
+
+def test_solve_reduced_matches_exact_with_zeros():
+    rng = random.Random(20)
+    for _ in range(500):
+        L = rng.randint(1, 12)
+        n = rng.randint(1, 10)
+        items = [rng.choice([0, rng.randint(0, L)]) for _ in range(n)]
+        expected, _ = exact_bin_packing(items, L)
+        num_bins, placement = solve_reduced(exact_bin_packing, items, L)
+        assert num_bins == expected, (items, L)
+        _check_packing(items, L, num_bins, placement)
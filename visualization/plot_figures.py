@@ -246,6 +246,75 @@ def plot_large_n_relative_ratio(algo_df: pd.DataFrame):
             plt.close()
 
 
+# Graph Group 3: Large-n ratio against the L2 lower bound
+def plot_large_n_ratio_vs_lb(algo_df: pd.DataFrame):
+    """
+    Graph Group 3 (large-n): for each (dist, L), plot
+
+        ratio_vs_lb = avg( bins(algo) / L2 lower bound )
+
+    for large n (n > 30). Unlike the relative ratio, this compares every
+    heuristic against a bound on OPT, and it is never below the true ratio.
+    """
+
+    if "ratio_vs_lb" not in algo_df.columns:
+        print("[Group 3] No ratio_vs_lb column; skip ratio-vs-LB plot.")
+        return
+
+    heuristics = ["BF", "BFD", "FF", "FFD", "NF"]
+    out_dir = "visualization/figs/group3_relative_ratio"
+    os.makedirs(out_dir, exist_ok=True)
+
+    df = algo_df[algo_df["ratio_vs_lb"].notna() & (algo_df["n"] > 30)]
+
+    for dist in sorted(df["dist"].unique()):
+        for L in sorted(df["L"].unique()):
+            sub = df[(df["dist"] == dist) & (df["L"] == L)]
+            if sub.empty:
+                continue
+
+            plt.figure(figsize=(6, 4))
+            ax = plt.gca()
+
+            for algo in heuristics:
+                curve = sub[sub["algo"] == algo].sort_values("n")
+                if curve.empty:
+                    continue
+                ax.plot(
+                    curve["n"],
+                    curve["ratio_vs_lb"],
+                    marker="o",
+                    markersize=5,
+                    linewidth=1.4,
+                    label=algo,
+                )
+
+            # The bound itself
+            ax.axhline(
+                1.0,
+                color="black",
+                linestyle="--",
+                linewidth=1.0,
+                label="L2 lower bound",
+            )
+
+            ax.set_title(f"Ratio vs L2 bound (large n) — {dist}, L={L}")
+            ax.set_xlabel("n")
+            ax.set_ylabel("avg bins / L2 lower bound")
+
+            ymin = max(0.95, sub["ratio_vs_lb"].min() - 0.02)
+            ymax = sub["ratio_vs_lb"].max() + 0.05
+            ax.set_ylim(ymin, ymax)
+
+            ax.grid(True, linestyle="--", alpha=0.3)
+            ax.legend()
+
+            safe_dist = dist.replace(" ", "_")
+            filename = f"{out_dir}/{safe_dist}_L{L}_ratio_vs_lb_vs_n.png"
+            plt.savefig(filename, dpi=200)
+            plt.close()
+
+
 # Overall average ratio bar chart (Group 4-1)
 def plot_overall_avg_ratio(algo_df: pd.DataFrame):
     heuristics = ["BF", "BFD", "FF", "FFD", "NF"]
@@ -360,6 +429,7 @@ if __name__ == "__main__":
     plot_ratio_vs_n()
     plot_runtime_vs_n()
     plot_large_n_relative_ratio(merged)
+    plot_large_n_ratio_vs_lb(merged)
     plot_overall_avg_ratio(merged)
     plot_overall_avg_ratio_vs_best(merged, exact_threshold=30)
     print("All graphs generated!")